@@ -1,4 +1,8 @@
 import heapq
+import multiprocessing
+from array import array
+
+from priority_queue import LazyHeap
 
 class Node:
     def __init__(self, value):
@@ -31,51 +35,74 @@ class Tree:
         if node_val in self.nodes:
             self.nodes[node_val].h_score = h_value
     
-    def a_star_search(self, start_val, goal_val):
+    def a_star_search(self, start_val, goal_val, trace=None):
+        # A false trace skips tracing, trace=True collects the events into a
+        # list and a callable receives each event as soon as a node is expanded
+        if trace and trace is not True and not callable(trace):
+            raise TypeError(f"trace must be True, a callable or false, got {trace!r}")
         if start_val not in self.nodes or goal_val not in self.nodes:
             return None, "Start or goal node not found in the tree"
         
+        steps = [] if trace is True else None
+        emit = steps.append if trace is True else (trace or None)
+        search = self._search(start_val, goal_val, emit is not None)
+        
+        try:
+            while True:
+                emit(next(search))
+        except StopIteration as done:
+            path = done.value
+        
+        if path is None:
+            return None, "No path found"
+        return path, steps
+    
+    def iter_a_star_search(self, start_val, goal_val):
+        # Generator mode: yields one event per expansion, the path is the return value
+        if start_val not in self.nodes or goal_val not in self.nodes:
+            return None
+        return (yield from self._search(start_val, goal_val, True))
+    
+    def _search(self, start_val, goal_val, traced):
+        # Events are diffs: the open set loses 'current' and gains 'pushed',
+        # the closed set gains 'current'. Nothing is yielded when not traced.
+        
+        # Reset scores left over from a previous query
+        for node in self.nodes.values():
+            node.g_score = float('inf')
+            node.f_score = float('inf')
+            node.parent = None
+        
         # Initialize start node
         start_node = self.nodes[start_val]
         start_node.g_score = 0
         start_node.f_score = start_node.h_score
         
-        # Priority queue for open set (nodes to be evaluated)
-        open_set = [(start_node.f_score, start_val)]
-        open_set_hash = {start_val}  # For faster lookup
+        # Priority queue for open set (nodes to be evaluated); an improved
+        # f_score replaces the node's live entry
+        open_set = LazyHeap()
+        open_set.push(start_val, start_node.f_score)
         
         # Closed set (nodes already evaluated)
         closed_set = set()
         
-        # Path tracking
-        path_found = False
-        
-        # For visualization
-        steps = []
-        
         while open_set:
             # Get node with lowest f_score
-            current_f, current_val = heapq.heappop(open_set)
+            current_f, current_val = open_set.pop()
             current_node = self.nodes[current_val]
             
-            # Remove from open set
-            open_set_hash.remove(current_val)
-            
             # Add to closed set
             closed_set.add(current_val)
             
-            # Record step for visualization
-            steps.append({
-                'current': current_val,
-                'open_set': [n for _, n in open_set],
-                'closed_set': list(closed_set)
-            })
-            
             # Check if goal reached
             if current_val == goal_val:
-                path_found = True
+                if traced:
+                    yield {'current': current_val, 'g': current_node.g_score,
+                           'f': current_f, 'pushed': []}
                 break
             
+            pushed = [] if traced else None
+            
             # Explore neighbors (children)
             for child_node in current_node.children:
                 child_val = child_node.value
@@ -95,25 +122,144 @@ class Tree:
                     child_node.g_score = tentative_g_score
                     child_node.f_score = tentative_g_score + child_node.h_score
                     
-                    # Add to open set if not already there
-                    if child_val not in open_set_hash:
-                        heapq.heappush(open_set, (child_node.f_score, child_val))
-                        open_set_hash.add(child_val)
-        
-        # Reconstruct path if found
-        if path_found:
-            path = []
-            current = self.nodes[goal_val]
+                    # Add to open set, or replace its entry with the better key
+                    if traced and child_val not in open_set:
+                        pushed.append(child_val)
+                    open_set.push(child_val, child_node.f_score)
+            
+            if traced:
+                yield {'current': current_val, 'g': current_node.g_score,
+                       'f': current_f, 'pushed': pushed}
+        else:
+            return None
+        
+        # Reconstruct path
+        path = []
+        current = self.nodes[goal_val]
+        
+        while current:
+            path.append(current.value)
+            current = current.parent
+        
+        path.reverse()
+        return path
+    
+    def compile(self):
+        # Freeze the current tree into an array-backed graph for repeated queries
+        return CompiledTree(self)
+
+class CompiledTree:
+    def __init__(self, tree):
+        # Node values are mapped to dense integer ids in insertion order
+        self.values = list(tree.nodes)
+        self.ids = {value: i for i, value in enumerate(self.values)}
+        n = len(self.values)
+        
+        # CSR adjacency: children of node i are targets[offsets[i]:offsets[i + 1]]
+        self.offsets = array('i', [0] * (n + 1))
+        self.targets = array('i')
+        self.h_score = array('d', [0.0] * n)
+        for i, value in enumerate(self.values):
+            node = tree.nodes[value]
+            self.h_score[i] = node.h_score
+            for child_node in node.children:
+                self.targets.append(self.ids[child_node.value])
+            self.offsets[i + 1] = len(self.targets)
+        
+        # Per-query state, only valid where the stamp equals the current generation
+        self.g_score = array('d', [0.0] * n)
+        self.parent = array('i', [-1] * n)
+        self.seen = array('i', [0] * n)
+        self.closed = array('i', [0] * n)
+        self.generation = 0
+    
+    def _next_generation(self):
+        self.generation += 1
+        if self.generation >= 2 ** 31 - 1:
+            # Stamps are about to overflow, so clear them once and start over
+            n = len(self.values)
+            self.seen = array('i', [0] * n)
+            self.closed = array('i', [0] * n)
+            self.generation = 1
+        return self.generation
+    
+    def a_star_search(self, start_val, goal_val):
+        # Same contract as Tree.a_star_search with tracing off: (path, None)
+        # on success, (None, message) otherwise. With unit edge costs the
+        # path cost is len(path) - 1.
+        if start_val not in self.ids or goal_val not in self.ids:
+            return None, "Start or goal node not found in the tree"
+        
+        start = self.ids[start_val]
+        goal = self.ids[goal_val]
+        gen = self._next_generation()
+        
+        offsets = self.offsets
+        targets = self.targets
+        h_score = self.h_score
+        g_score = self.g_score
+        parent = self.parent
+        seen = self.seen
+        closed = self.closed
+        
+        g_score[start] = 0.0
+        parent[start] = -1
+        seen[start] = gen
+        open_set = [(h_score[start], start)]
+        
+        while open_set:
+            _, current = heapq.heappop(open_set)
             
-            while current:
-                path.append(current.value)
-                current = current.parent
+            # Skip stale heap entries for nodes already evaluated
+            if closed[current] == gen:
+                continue
+            closed[current] = gen
             
-            path.reverse()
-            return path, steps
+            if current == goal:
+                path = []
+                while current != -1:
+                    path.append(self.values[current])
+                    current = parent[current]
+                path.reverse()
+                return path, None
+            
+            # Assuming each edge has a cost of 1
+            tentative_g_score = g_score[current] + 1
+            for i in range(offsets[current], offsets[current + 1]):
+                child = targets[i]
+                if closed[child] == gen:
+                    continue
+                
+                if seen[child] != gen or tentative_g_score < g_score[child]:
+                    seen[child] = gen
+                    g_score[child] = tentative_g_score
+                    parent[child] = current
+                    heapq.heappush(open_set, (tentative_g_score + h_score[child], child))
         
         return None, "No path found"
 
+# Compiled graph shared by the batch workers, set once per worker process
+_batch_graph = None
+
+def _init_batch_worker(graph):
+    global _batch_graph
+    _batch_graph = graph
+
+def _batch_a_star_search(query):
+    start_val, goal_val = query
+    path, _ = _batch_graph.a_star_search(start_val, goal_val)
+    return start_val, goal_val, path
+
+def batch_a_star_search(tree, queries, workers=None, ordered=True, chunksize=64):
+    # Answers an iterable of (start, goal) pairs on a process pool and yields
+    # (start, goal, path) tuples, with path None when there is no route.
+    # The graph is compiled once and handed to each worker through the pool
+    # initializer (inherited on fork), never pickled per query.
+    graph = tree.compile() if isinstance(tree, Tree) else tree
+    with multiprocessing.Pool(workers, initializer=_init_batch_worker, initargs=(graph,)) as pool:
+        mapper = pool.imap if ordered else pool.imap_unordered
+        yield from mapper(_batch_a_star_search, queries, chunksize)
+
 def main():
     
     tree = Tree()
@@ -164,18 +310,24 @@ def main():
         goal_val = input("Enter goal node: ")
         
         # Run A* search
-        path, steps = tree.a_star_search(start_val, goal_val)
+        path, steps = tree.a_star_search(start_val, goal_val, trace=True)
         
         # Display results
         if isinstance(path, list):
             print("\nPath found:", " -> ".join(path))
             
+            # Rebuild the open and closed sets from the per-step diffs
             print("\nSearch steps:")
+            open_set = [start_val]
+            closed_set = []
             for i, step in enumerate(steps):
+                open_set.remove(step['current'])
+                closed_set.append(step['current'])
                 print(f"Step {i+1}:")
                 print(f"  Current node: {step['current']}")
-                print(f"  Open set: {', '.join(step['open_set']) if step['open_set'] else 'empty'}")
-                print(f"  Closed set: {', '.join(step['closed_set'])}")
+                print(f"  Open set: {', '.join(open_set) if open_set else 'empty'}")
+                print(f"  Closed set: {', '.join(closed_set)}")
+                open_set.extend(step['pushed'])
         else:
             print("\nError:", steps)
             
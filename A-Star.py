@@ -1,19 +1,10 @@
 import heapq
+import json
+import multiprocessing
+from array import array
 
-def input_weighted_tree():
-    tree = {}
-    n = int(input("Enter number of nodes in the tree: "))
-    print("For each node, enter children in format: child:cost (comma-separated), or leave blank if none.")
-    for _ in range(n):
-        node = input("Node: ")
-        children_input = input(f"Children of {node}: ")
-        children = []
-        if children_input:
-            for child_pair in children_input.split(','):
-                child, cost = child_pair.strip().split(':')
-                children.append((child.strip(), int(cost)))
-        tree[node] = children
-    return tree
+from Input import input_weighted_tree
+from priority_queue import LazyHeap, RadixHeap
 
 def get_all_nodes(tree):
     # Collect all nodes including children
@@ -23,30 +14,129 @@ def get_all_nodes(tree):
             all_nodes.add(child)
     return all_nodes
 
+def reverse_tree(tree):
+    # Reverse adjacency: for every edge node -> child, child maps back to node
+    reverse = {node: [] for node in get_all_nodes(tree)}
+    for node in tree:
+        for child, cost in tree[node]:
+            reverse[child].append((node, cost))
+    return reverse
+
 def heuristic(a, b):
-    # Simple heuristic: difference of ASCII values
-    return abs(ord(str(a)) - ord(str(b)))
+    # Without landmarks there is no information about distances, so the
+    # search falls back to uniform cost (see build_landmarks)
+    return 0
+
+def dijkstra_distances(tree, source, index):
+    # One-to-all shortest path costs from source, indexed by node id
+    dist = array('d', [float('inf')] * len(index))
+    dist[index[source]] = 0
+    heap = [(0, source)]
+    while heap:
+        d, current = heapq.heappop(heap)
+        if d > dist[index[current]]:
+            continue
+        for neighbor, cost in tree.get(current, []):
+            if d + cost < dist[index[neighbor]]:
+                dist[index[neighbor]] = d + cost
+                heapq.heappush(heap, (d + cost, neighbor))
+    return dist
+
+class Landmarks:
+    # ALT lower bounds from precomputed distances to and from k landmarks
+    def __init__(self, nodes, landmarks, from_landmark, to_landmark):
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.landmarks = landmarks
+        self.from_landmark = from_landmark  # d(L, v) for each landmark L
+        self.to_landmark = to_landmark      # d(v, L) for each landmark L
+    
+    def heuristic(self, a, b):
+        # Triangle inequality: d(a, b) >= d(L, b) - d(L, a) and d(a, L) - d(b, L)
+        i = self.index.get(a)
+        j = self.index.get(b)
+        if i is None or j is None:
+            return 0
+        best = 0
+        inf = float('inf')
+        for dist in self.from_landmark:
+            if dist[i] != inf and dist[j] != inf and dist[j] - dist[i] > best:
+                best = dist[j] - dist[i]
+        for dist in self.to_landmark:
+            if dist[i] != inf and dist[j] != inf and dist[i] - dist[j] > best:
+                best = dist[i] - dist[j]
+        return best
+    
+    def save(self, path):
+        # A JSON header line followed by the raw distance arrays
+        header = {'nodes': self.nodes, 'landmarks': self.landmarks}
+        with open(path, 'wb') as f:
+            f.write(json.dumps(header).encode() + b'\n')
+            for dist in self.from_landmark + self.to_landmark:
+                dist.tofile(f)
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            header = json.loads(f.readline())
+            n = len(header['nodes'])
+            tables = []
+            for _ in range(2 * len(header['landmarks'])):
+                dist = array('d')
+                dist.fromfile(f, n)
+                tables.append(dist)
+        k = len(header['landmarks'])
+        return cls(header['nodes'], header['landmarks'], tables[:k], tables[k:])
 
-def a_star(tree, start, goal):
-    # Initialize all nodes
-    all_nodes = get_all_nodes(tree)
+def build_landmarks(tree, k=4):
+    # Farthest-point selection: each new landmark is the node whose nearest
+    # chosen landmark is farthest away, unreachable nodes counting as farthest
+    nodes = sorted(get_all_nodes(tree))
+    index = {node: i for i, node in enumerate(nodes)}
+    reverse = reverse_tree(tree)
     
-    open_list = []
-    heapq.heappush(open_list, (0, start))
+    landmarks = []
+    from_landmark = []
+    to_landmark = []
+    nearest = [float('inf')] * len(nodes)
+    candidate = nodes[0] if nodes else None
     
-    # Initialize scores for all nodes
-    g_scores = {node: float('inf') for node in all_nodes}
-    g_scores[start] = 0
+    for _ in range(min(k, len(nodes))):
+        landmarks.append(candidate)
+        from_landmark.append(dijkstra_distances(tree, candidate, index))
+        to_landmark.append(dijkstra_distances(reverse, candidate, index))
+        
+        for i in range(len(nodes)):
+            nearest[i] = min(nearest[i], from_landmark[-1][i] + to_landmark[-1][i])
+        chosen = set(landmarks)
+        candidate = max((node for node in nodes if node not in chosen),
+                        key=lambda node: nearest[index[node]], default=None)
+        if candidate is None:
+            break
+    
+    return Landmarks(nodes, landmarks, from_landmark, to_landmark)
+
+def a_star(tree, start, goal, stats=None, heuristic=heuristic, queue=LazyHeap):
+    # queue is LazyHeap (stale entries skipped, the fastest in the
+    # priority_queue benchmark) or IndexedHeap (decrease-key, a smaller heap);
+    # either way each node has one live entry at a time
+    # Scores exist only for nodes the search reaches, so a short route costs
+    # nothing per node of the rest of the graph
+    g_scores = {start: 0}
     
-    f_scores = {node: float('inf') for node in all_nodes}
-    f_scores[start] = heuristic(start, goal)
+    open_list = queue()
+    open_list.push(start, heuristic(start, goal))
     
     came_from = {}
+    expanded = 0
     
     while open_list:
-        _, current = heapq.heappop(open_list)
+        _, current = open_list.pop()
+        expanded += 1
         
         if current == goal:
+            if stats is not None:
+                stats.update(expanded=expanded, max_heap=open_list.max_size)
             path = []
             while current in came_from:
                 path.append(current)
@@ -57,14 +147,122 @@ def a_star(tree, start, goal):
         for neighbor, cost in tree.get(current, []):
             tentative_g_score = g_scores[current] + cost
             
-            if tentative_g_score < g_scores[neighbor]:
+            if tentative_g_score < g_scores.get(neighbor, float('inf')):
                 came_from[neighbor] = current
                 g_scores[neighbor] = tentative_g_score
-                f_scores[neighbor] = tentative_g_score + heuristic(neighbor, goal)
-                heapq.heappush(open_list, (f_scores[neighbor], neighbor))
+                open_list.push(neighbor, tentative_g_score + heuristic(neighbor, goal))
     
+    if stats is not None:
+        stats.update(expanded=expanded, max_heap=open_list.max_size)
     return None
 
+def uniform_cost_search(tree, start, goal, stats=None):
+    # Dijkstra on the integer costs read by input_weighted_tree: with a zero
+    # heuristic the keys never decrease, so the monotone radix heap applies
+    return a_star(tree, start, goal, stats, heuristic=lambda a, b: 0, queue=RadixHeap)
+
+def bidirectional_a_star(tree, start, goal, stats=None, reverse=None, heuristic=heuristic,
+                         queue=LazyHeap):
+    # Forward search from start on tree, backward search from goal on the
+    # reverse index. Both use admissible heuristics, so once the smaller key
+    # on either side reaches the best meeting cost no shorter path remains.
+    if reverse is None:
+        reverse = reverse_tree(tree)
+    
+    if start == goal:
+        if stats is not None:
+            stats.update(expanded=0, forward=0, backward=0)
+        return [start]
+    
+    g_forward = {start: 0}
+    g_backward = {goal: 0}
+    parent_forward = {start: None}
+    parent_backward = {goal: None}
+    open_forward = queue()
+    open_forward.push(start, heuristic(start, goal))
+    open_backward = queue()
+    open_backward.push(goal, heuristic(start, goal))
+    
+    best_cost = float('inf')
+    meeting = None
+    expanded = {'forward': 0, 'backward': 0}
+    
+    while open_forward and open_backward:
+        top_forward = open_forward.peek()[0]
+        top_backward = open_backward.peek()[0]
+        if top_forward >= best_cost or top_backward >= best_cost:
+            break
+        
+        # Expand the side with the smaller key
+        if top_forward <= top_backward:
+            side, graph, open_list = 'forward', tree, open_forward
+            g_this, g_other, parents = g_forward, g_backward, parent_forward
+        else:
+            side, graph, open_list = 'backward', reverse, open_backward
+            g_this, g_other, parents = g_backward, g_forward, parent_backward
+        
+        _, current = open_list.pop()
+        g_current = g_this[current]
+        expanded[side] += 1
+        
+        for neighbor, cost in graph.get(current, []):
+            tentative_g_score = g_current + cost
+            
+            if tentative_g_score < g_this.get(neighbor, float('inf')):
+                g_this[neighbor] = tentative_g_score
+                parents[neighbor] = current
+                if side == 'forward':
+                    h = heuristic(neighbor, goal)
+                else:
+                    h = heuristic(start, neighbor)
+                open_list.push(neighbor, tentative_g_score + h)
+                
+                # Record the best path through a node both searches have reached
+                if neighbor in g_other and tentative_g_score + g_other[neighbor] < best_cost:
+                    best_cost = tentative_g_score + g_other[neighbor]
+                    meeting = neighbor
+    
+    if stats is not None:
+        stats.update(expanded=expanded['forward'] + expanded['backward'], **expanded)
+    
+    if meeting is None:
+        return None
+    
+    path = []
+    current = meeting
+    while current is not None:
+        path.append(current)
+        current = parent_forward[current]
+    path.reverse()
+    
+    current = parent_backward[meeting]
+    while current is not None:
+        path.append(current)
+        current = parent_backward[current]
+    return path
+
+# Graph shared by the batch workers, set once per worker process
+_batch_tree = None
+_batch_heuristic = heuristic
+
+def _init_batch_worker(tree, batch_heuristic):
+    global _batch_tree, _batch_heuristic
+    _batch_tree = tree
+    _batch_heuristic = batch_heuristic
+
+def _batch_a_star(query):
+    start, goal = query
+    return start, goal, a_star(_batch_tree, start, goal, heuristic=_batch_heuristic)
+
+def a_star_batch(tree, queries, workers=None, ordered=True, chunksize=64, heuristic=heuristic):
+    # Answers an iterable of (start, goal) pairs on a process pool and yields
+    # (start, goal, path) tuples, in submission order or as they complete.
+    # The tree is handed to each worker once through the pool initializer
+    # (inherited on fork), never pickled per query.
+    with multiprocessing.Pool(workers, initializer=_init_batch_worker, initargs=(tree, heuristic)) as pool:
+        mapper = pool.imap if ordered else pool.imap_unordered
+        yield from mapper(_batch_a_star, queries, chunksize)
+
 def main():
     print("A* Algorithm Implementation")
     print("==========================")
@@ -73,13 +271,23 @@ def main():
         tree = input_weighted_tree()
         start = input("\nEnter start node: ")
         goal = input("Enter goal node: ")
+        mode = input("Search mode (1 = A*, 2 = bidirectional A*, 3 = uniform cost): ").strip()
         
         print("\nSearching for path...")
-        path = a_star(tree, start, goal)
+        stats = {}
+        if mode == '3':
+            path = uniform_cost_search(tree, start, goal, stats)
+        else:
+            landmarks = build_landmarks(tree)
+            if mode == '2':
+                path = bidirectional_a_star(tree, start, goal, stats, heuristic=landmarks.heuristic)
+            else:
+                path = a_star(tree, start, goal, stats, heuristic=landmarks.heuristic)
         
         if path:
             print("\nPath found!")
             print("Path:", " -> ".join(path))
+            print("Nodes expanded:", stats['expanded'])
             print("\nNote: Numbers show the order of nodes visited")
         else:
             print("\nNo path found between", start, "and", goal)
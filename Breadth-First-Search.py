@@ -1,21 +1,91 @@
-from collections import defaultdict, deque
+import heapq
+import mmap
+import os
+import time
+from array import array
+from collections import deque
+
+from graph_storage import AdjacencyLists, ComponentIndex, CSRGraph, NodeTable
 
 class Tree:
     def __init__(self):
-        self.graph = defaultdict(list)
+        self.nodes = NodeTable()
+        self.adjacency = AdjacencyLists(self.nodes)   # live id adjacency
+        self.components = ComponentIndex(self.nodes)
+        self.trackers = []   # DynamicLevels kept current by add_edge
+        self.compiled = None
     
     def add_edge(self, u, v):
-        self.graph[u].append(v)
-        self.graph[v].append(u)
+        # Both directions are appended to the id arrays in place, so bfs()
+        # needs no rebuild; only the CSR snapshot is dropped
+        u = self.nodes.intern(u)
+        v = self.nodes.intern(v)
+        self.adjacency.add_edge(u, v)
+        self.adjacency.add_edge(v, u)
+        self.components.union_ids(u, v)
+        for tracker in self.trackers:
+            tracker.edge_added(u, v)
+        self.compiled = None
+    
+    def track_levels(self, root):
+        # Register a root whose hop levels are updated on every add_edge
+        tracker = DynamicLevels(self.adjacency, self.nodes.intern(root))
+        self.trackers.append(tracker)
+        # Interning the root may have added a node the snapshot does not cover
+        self.compiled = None
+        return tracker
+    
+    def compile(self):
+        # CSR snapshot for the level and hop distance engines, rebuilt from
+        # the id arrays only when they ask for it after new edges
+        if self.compiled is None:
+            self.compiled = BFSGraph.from_lists(self.adjacency)
+        return self.compiled
+    
+    def bfs_levels(self, start_node, alpha=14, beta=24):
+        # Direction-optimizing BFS; returns the levels as lists of node names
+        # and one timing record per level
+        if self.adjacency.id_of(start_node) is None:
+            return f"Node {start_node} not found in the tree", []
+        
+        graph = self.compile()
+        levels, timings = graph.bfs_levels(graph.ids[start_node], alpha, beta)
+        return [[graph.names[i] for i in level] for level in levels], timings
+    
+    def hop_distances(self, sources=None, lanes=64, typecode='B', path=None):
+        # All-pairs (or many-source) hop distances. Returns the column order of
+        # node names and the flat matrix with one row per source.
+        graph = self.compile()
+        if sources is not None:
+            ids = []
+            for name in sources:
+                if name not in graph.ids:
+                    return f"Node {name} not found in the tree", None
+                ids.append(graph.ids[name])
+            sources = ids
+        return graph.names, graph.hop_distances(sources, lanes, typecode, path)
+    
+    def write_edge_file(self, path):
+        # Edge list for external_bfs: one 'u v' line per direction, sorted by u
+        names = self.nodes.names
+        edges = sorted((names[u], names[v])
+                       for u, neighbors in enumerate(self.adjacency.lists)
+                       for v in neighbors)
+        with open(path, 'w') as f:
+            for u, v in edges:
+                f.write(f"{u} {v}\n")
     
     def bfs(self, start_node):
-        if start_node not in self.graph:
+        start = self.adjacency.id_of(start_node)
+        if start is None:
             return f"Node {start_node} not found in the tree"
         
-        visited = set()
+        # Traverse the live id arrays and translate back to names at the end
+        lists = self.adjacency.lists
+        visited = bytearray(len(lists))
         
-        queue = deque([start_node])
-        visited.add(start_node)
+        queue = deque([start])
+        visited[start] = 1
         
         bfs_traversal = []
         
@@ -23,12 +93,340 @@ class Tree:
             current = queue.popleft()
             bfs_traversal.append(current)
             
-            for neighbor in self.graph[current]:
-                if neighbor not in visited:
-                    visited.add(neighbor)
+            for neighbor in lists[current]:
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
                     queue.append(neighbor)
         
-        return bfs_traversal
+        names = self.nodes.names
+        return [names[i] for i in bfs_traversal]
+
+class DynamicLevels:
+    # Hop levels from one root under edge insertions. A new edge can only
+    # lower levels, so the repair is a BFS started at the endpoint whose level
+    # improved that stops wherever levels are already small enough. Levels are
+    # kept by node id on the tree's AdjacencyLists and reported by name.
+    def __init__(self, adjacency, root):
+        self.adjacency = adjacency
+        self.root = root
+        self.level = {root: 0}
+        self._propagate(root)
+    
+    def edge_added(self, u, v):
+        level_u = self.level.get(u)
+        level_v = self.level.get(v)
+        if level_u is not None and (level_v is None or level_u + 1 < level_v):
+            self.level[v] = level_u + 1
+            self._propagate(v)
+        elif level_v is not None and (level_u is None or level_v + 1 < level_u):
+            self.level[u] = level_v + 1
+            self._propagate(u)
+    
+    def _propagate(self, node):
+        level = self.level
+        queue = deque([node])
+        while queue:
+            current = queue.popleft()
+            next_level = level[current] + 1
+            for neighbor in self.adjacency.neighbors(current):
+                if level.get(neighbor, next_level + 1) > next_level:
+                    level[neighbor] = next_level
+                    queue.append(neighbor)
+    
+    def level_of(self, node):
+        # None while node is unreachable from the root
+        return self.level.get(self.adjacency.nodes.ids.get(node))
+    
+    def levels(self):
+        # Node names grouped by hop level
+        names = self.adjacency.nodes.names
+        grouped = []
+        for node, depth in self.level.items():
+            while len(grouped) <= depth:
+                grouped.append([])
+            grouped[depth].append(names[node])
+        return grouped
+
+class BFSGraph(CSRGraph):
+    # Traversal engines over the shared CSR storage
+    
+    def bfs_levels(self, start, alpha=14, beta=24):
+        # Beamer's direction-optimizing BFS. A level is expanded top-down from
+        # the frontier while the frontier's edges are few, and bottom-up (every
+        # unvisited node looks for a parent in the frontier) once they exceed
+        # 1/alpha of the unexplored edges, until the frontier shrinks below
+        # n/beta nodes. Top-down levels keep the discovery order of bfs(), so
+        # with no bottom-up step the concatenated levels equal bfs(); bottom-up
+        # levels hold the same nodes listed in id order.
+        offsets = self.offsets
+        targets = self.targets
+        n = len(self.names)
+        
+        visited = bytearray(n)
+        visited[start] = 1
+        frontier = [start]
+        unexplored_edges = len(targets) - (offsets[start + 1] - offsets[start])
+        top_down = True
+        
+        levels = []
+        timings = []
+        
+        while frontier:
+            begin = time.perf_counter()
+            frontier_edges = sum(offsets[u + 1] - offsets[u] for u in frontier)
+            if top_down and frontier_edges > unexplored_edges / alpha:
+                top_down = False
+            elif not top_down and len(frontier) < n / beta:
+                top_down = True
+            
+            next_frontier = []
+            if top_down:
+                for u in frontier:
+                    for i in range(offsets[u], offsets[u + 1]):
+                        v = targets[i]
+                        if not visited[v]:
+                            visited[v] = 1
+                            next_frontier.append(v)
+            else:
+                in_frontier = bytearray(n)
+                for u in frontier:
+                    in_frontier[u] = 1
+                for v in range(n):
+                    if visited[v]:
+                        continue
+                    for i in range(offsets[v], offsets[v + 1]):
+                        if in_frontier[targets[i]]:
+                            visited[v] = 1
+                            next_frontier.append(v)
+                            break
+            
+            unexplored_edges -= sum(offsets[v + 1] - offsets[v] for v in next_frontier)
+            levels.append(frontier)
+            timings.append({
+                'level': len(levels) - 1,
+                'direction': 'top-down' if top_down else 'bottom-up',
+                'frontier': len(frontier),
+                'seconds': time.perf_counter() - begin,
+            })
+            frontier = next_frontier
+        
+        return levels, timings
+    
+    def hop_distances(self, sources=None, lanes=64, typecode='B', path=None):
+        # Bit-parallel multi-source BFS: up to `lanes` traversals run together,
+        # each node holding one bit per source in its visited and frontier
+        # words. Returns a flat row-major matrix with one row of n hop counts
+        # per source, the typecode's maximum marking unreachable nodes. When
+        # path is given the matrix is a memory-mapped file instead of an array.
+        # Only 'B' and 'H' are supported, whose maximum is all one bits.
+        if typecode not in ('B', 'H'):
+            raise ValueError(f"Unsupported typecode '{typecode}', use 'B' or 'H'")
+        n = len(self.names)
+        if sources is None:
+            sources = range(n)
+        sources = list(sources)
+        unreachable = 255 if typecode == 'B' else 65535
+        
+        size = len(sources) * n
+        if path is None:
+            matrix = array(typecode, [unreachable]) * size
+        else:
+            itemsize = array(typecode).itemsize
+            with open(path, 'w+b') as f:
+                f.truncate(size * itemsize)
+                buffer = mmap.mmap(f.fileno(), size * itemsize) if size else bytearray()
+            # Both unreachable markers are all one bits, so fill bytewise in chunks
+            chunk = 1 << 20
+            for i in range(0, size * itemsize, chunk):
+                end = min(i + chunk, size * itemsize)
+                buffer[i:end] = b'\xff' * (end - i)
+            matrix = memoryview(buffer).cast('B').cast(typecode)
+        
+        offsets = self.offsets
+        targets = self.targets
+        
+        for base in range(0, len(sources), lanes):
+            batch = sources[base:base + lanes]
+            visited = [0] * n
+            frontier = {}
+            for bit, source in enumerate(batch):
+                visited[source] |= 1 << bit
+                frontier[source] = frontier.get(source, 0) | 1 << bit
+                matrix[(base + bit) * n + source] = 0
+            
+            level = 0
+            while frontier:
+                level += 1
+                reached = {}
+                for u, bits in frontier.items():
+                    for i in range(offsets[u], offsets[u + 1]):
+                        v = targets[i]
+                        reached[v] = reached.get(v, 0) | bits
+                
+                frontier = {}
+                for v, bits in reached.items():
+                    bits &= ~visited[v]
+                    if not bits:
+                        continue
+                    if level >= unreachable:
+                        raise ValueError(f"Hop distance {level} does not fit typecode '{typecode}'")
+                    visited[v] |= bits
+                    frontier[v] = bits
+                    while bits:
+                        low = bits & -bits
+                        matrix[(base + low.bit_length() - 1) * n + v] = level
+                        bits ^= low
+        
+        if path is not None and size:
+            buffer.flush()
+        return matrix
+
+def _source(line):
+    return line.split(b' ', 1)[0]
+
+def _seek_source(f, size, node):
+    # Binary search the sorted edge file for the first line whose source is
+    # at least node. lo is always a line start with only smaller sources
+    # before it, hi a line start (or the end) whose source is not smaller.
+    lo, hi = 0, size
+    while hi - lo > 4096:
+        mid = (lo + hi) // 2
+        f.seek(mid - 1)
+        f.readline()
+        pos = f.tell()
+        if pos >= hi:
+            break
+        line = f.readline()
+        if _source(line) < node:
+            lo = pos + len(line)
+        else:
+            hi = pos
+    
+    f.seek(lo)
+    while True:
+        pos = f.tell()
+        line = f.readline()
+        if not line or _source(line) >= node:
+            f.seek(pos)
+            return
+
+def _write_lines(path, lines):
+    with open(path, 'wb') as f:
+        f.writelines(lines)
+
+def _merge_runs(run_paths, output_path):
+    # Merges sorted runs into output_path with duplicates removed, then
+    # deletes the runs
+    files = [open(run_path, 'rb') for run_path in run_paths]
+    try:
+        with open(output_path, 'wb') as out:
+            previous = None
+            for line in heapq.merge(*files):
+                if line != previous:
+                    out.write(line)
+                    previous = line
+    finally:
+        for f in files:
+            f.close()
+        for run_path in run_paths:
+            os.remove(run_path)
+
+def external_sort(input_path, output_path, chunk_lines, fan_in=64):
+    # Sorts the lines of input_path into output_path with duplicates removed,
+    # holding at most chunk_lines lines in memory at a time. Runs are merged
+    # in passes of at most fan_in files, so no more than fan_in + 1 files are
+    # open at once however many runs the input produces.
+    runs = []
+    with open(input_path, 'rb') as f:
+        while True:
+            chunk = [line for _, line in zip(range(chunk_lines), f)]
+            if not chunk:
+                break
+            run_path = f"{output_path}.run{len(runs)}"
+            _write_lines(run_path, sorted(set(chunk)))
+            runs.append(run_path)
+    
+    merge_pass = 0
+    while len(runs) > fan_in:
+        merged = []
+        for i in range(0, len(runs), fan_in):
+            run_path = f"{output_path}.pass{merge_pass}.run{len(merged)}"
+            _merge_runs(runs[i:i + fan_in], run_path)
+            merged.append(run_path)
+        runs = merged
+        merge_pass += 1
+    
+    _merge_runs(runs, output_path)
+
+def _iter_lines(path):
+    if path is None:
+        return
+    with open(path, 'rb') as f:
+        yield from f
+
+def read_level(path):
+    # Node names of one level file written by external_bfs
+    for line in _iter_lines(path):
+        yield line.rstrip(b'\n').decode()
+
+def external_bfs(edge_path, start_node, workdir, chunk_lines=1000000):
+    # Out-of-core BFS in the style of Munagala and Ranade. edge_path holds one
+    # 'u v' line per directed edge, sorted by u, with both directions of every
+    # undirected edge (see Tree.write_edge_file). Every level is a sorted file
+    # in workdir; the next level is the sorted, de-duplicated neighbor list of
+    # the current one minus the current and previous levels. Yields
+    # (depth, level_path) pairs. Levels hold the same nodes as bfs() gives per
+    # depth, listed in sorted order. Peak memory is about chunk_lines lines.
+    os.makedirs(workdir, exist_ok=True)
+    start = start_node.encode()
+    size = os.path.getsize(edge_path)
+    
+    previous_path = None
+    current_path = os.path.join(workdir, "level-0.txt")
+    _write_lines(current_path, [start + b'\n'])
+    depth = 0
+    
+    with open(edge_path, 'rb') as edges:
+        while True:
+            yield depth, current_path
+            
+            # Gather the adjacency lists of the current level
+            neighbors_path = os.path.join(workdir, f"neighbors-{depth + 1}.txt")
+            with open(neighbors_path, 'wb') as out:
+                for node in _iter_lines(current_path):
+                    node = node.rstrip(b'\n')
+                    _seek_source(edges, size, node)
+                    for line in edges:
+                        source, _, target = line.rstrip(b'\n').partition(b' ')
+                        if source != node:
+                            break
+                        out.write(target + b'\n')
+            
+            sorted_path = neighbors_path + ".sorted"
+            external_sort(neighbors_path, sorted_path, chunk_lines)
+            os.remove(neighbors_path)
+            
+            # Remove nodes of the current and previous levels by merging
+            next_path = os.path.join(workdir, f"level-{depth + 1}.txt")
+            found = False
+            with open(next_path, 'wb') as out:
+                seen = heapq.merge(_iter_lines(previous_path), _iter_lines(current_path))
+                seen_line = next(seen, None)
+                for line in _iter_lines(sorted_path):
+                    while seen_line is not None and seen_line < line:
+                        seen_line = next(seen, None)
+                    if line != seen_line:
+                        out.write(line)
+                        found = True
+            os.remove(sorted_path)
+            
+            if not found:
+                os.remove(next_path)
+                return
+            
+            previous_path = current_path
+            current_path = next_path
+            depth += 1
 
 def main():
     tree = Tree()
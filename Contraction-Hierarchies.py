@@ -0,0 +1,239 @@
+import heapq
+import json
+
+from Input import input_weighted_tree
+
+def witness_search(out_edges, source, avoid, limit, max_settled):
+    # Local Dijkstra from source that never passes through avoid. It gives up
+    # past limit or after max_settled nodes, which can only add extra shortcuts.
+    dist = {source: 0}
+    heap = [(0, source)]
+    settled = 0
+    while heap and settled < max_settled:
+        d, current = heapq.heappop(heap)
+        if d > dist[current]:
+            continue
+        if d > limit:
+            break
+        settled += 1
+        for neighbor, cost in out_edges[current].items():
+            if neighbor == avoid:
+                continue
+            if d + cost < dist.get(neighbor, float('inf')):
+                dist[neighbor] = d + cost
+                heapq.heappush(heap, (d + cost, neighbor))
+    return dist
+
+class ContractionHierarchy:
+    def __init__(self, rank, up, down, middle):
+        self.rank = rank      # node -> contraction order
+        self.up = up          # node -> [(w, cost)] for edges node -> w going up
+        self.down = down      # node -> [(u, cost)] for edges u -> node coming down
+        self.middle = middle  # (u, w) -> contracted node a shortcut u -> w skips
+
+    @classmethod
+    def build(cls, tree, max_settled=50):
+        # Overlay graph of the nodes not contracted yet, parallel edges merged
+        out_edges = {}
+        in_edges = {}
+        for node in tree:
+            out_edges.setdefault(node, {})
+            in_edges.setdefault(node, {})
+            for child, cost in tree[node]:
+                out_edges.setdefault(child, {})
+                in_edges.setdefault(child, {})
+                if child != node and cost < out_edges[node].get(child, float('inf')):
+                    out_edges[node][child] = cost
+                    in_edges[child][node] = cost
+
+        def shortcuts_for(node):
+            shortcuts = []
+            for u, cost_in in in_edges[node].items():
+                targets = {w: cost_in + cost_out
+                           for w, cost_out in out_edges[node].items() if w != u}
+                if not targets:
+                    continue
+                dist = witness_search(out_edges, u, node, max(targets.values()), max_settled)
+                for w, cost in targets.items():
+                    if dist.get(w, float('inf')) > cost:
+                        shortcuts.append((u, w, cost))
+            return shortcuts
+
+        contracted_neighbors = {node: 0 for node in out_edges}
+
+        def priority(node):
+            # Edge difference plus the number of already contracted neighbors
+            removed = len(in_edges[node]) + len(out_edges[node])
+            return len(shortcuts_for(node)) - removed + contracted_neighbors[node]
+
+        queue = [(priority(node), node) for node in out_edges]
+        heapq.heapify(queue)
+        rank = {}
+        up = {}
+        down = {}
+        middle = {}
+
+        while queue:
+            _, node = heapq.heappop(queue)
+
+            # Lazy update: re-queue the node if its priority got worse
+            current = priority(node)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, node))
+                continue
+
+            for u, w, cost in shortcuts_for(node):
+                if cost < out_edges[u].get(w, float('inf')):
+                    out_edges[u][w] = cost
+                    in_edges[w][u] = cost
+                    middle[(u, w)] = node
+
+            rank[node] = len(rank)
+            up[node] = list(out_edges[node].items())
+            down[node] = list(in_edges[node].items())
+
+            for w in out_edges[node]:
+                del in_edges[w][node]
+                contracted_neighbors[w] += 1
+            for u in in_edges[node]:
+                del out_edges[u][node]
+                contracted_neighbors[u] += 1
+            del out_edges[node]
+            del in_edges[node]
+
+        return cls(rank, up, down, middle)
+
+    def save(self, path):
+        data = {
+            'rank': self.rank,
+            'up': self.up,
+            'down': self.down,
+            'middle': [[u, w, node] for (u, w), node in self.middle.items()],
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        up = {node: [tuple(edge) for edge in edges] for node, edges in data['up'].items()}
+        down = {node: [tuple(edge) for edge in edges] for node, edges in data['down'].items()}
+        middle = {(u, w): node for u, w, node in data['middle']}
+        return cls(data['rank'], up, down, middle)
+
+    def query(self, start, goal, stats=None):
+        # Bidirectional Dijkstra that only climbs the hierarchy: forward over
+        # up edges from start, backward over down edges from goal
+        if start not in self.rank or goal not in self.rank:
+            return None
+
+        dist = ({start: 0}, {goal: 0})
+        parents = ({start: None}, {goal: None})
+        heaps = ([(0, start)], [(0, goal)])
+        edges = (self.up, self.down)
+        done = [False, False]
+        best_cost = float('inf')
+        meeting = None
+        settled = 0
+
+        while not (done[0] and done[1]):
+            for side in (0, 1):
+                heap = heaps[side]
+                if done[side]:
+                    continue
+                # A side is finished once nothing below the best meeting cost remains
+                if not heap or heap[0][0] >= best_cost:
+                    done[side] = True
+                    continue
+
+                d, current = heapq.heappop(heap)
+                if d > dist[side][current]:
+                    continue
+                settled += 1
+
+                other = dist[1 - side]
+                if current in other and d + other[current] < best_cost:
+                    best_cost = d + other[current]
+                    meeting = current
+
+                for neighbor, cost in edges[side][current]:
+                    if d + cost < dist[side].get(neighbor, float('inf')):
+                        dist[side][neighbor] = d + cost
+                        parents[side][neighbor] = current
+                        heapq.heappush(heap, (d + cost, neighbor))
+
+        if stats is not None:
+            stats.update(settled=settled, cost=best_cost)
+
+        if meeting is None:
+            return None
+
+        hierarchy_path = []
+        current = meeting
+        while current is not None:
+            hierarchy_path.append(current)
+            current = parents[0][current]
+        hierarchy_path.reverse()
+        current = parents[1][meeting]
+        while current is not None:
+            hierarchy_path.append(current)
+            current = parents[1][current]
+
+        return self.unpack(hierarchy_path)
+
+    def unpack(self, hierarchy_path):
+        # Replace every shortcut by the two edges around its contracted node
+        path = [hierarchy_path[0]]
+        for u, w in zip(hierarchy_path, hierarchy_path[1:]):
+            stack = [(u, w)]
+            while stack:
+                a, b = stack.pop()
+                node = self.middle.get((a, b))
+                if node is None:
+                    path.append(b)
+                else:
+                    stack.append((node, b))
+                    stack.append((a, node))
+        return path
+
+def main():
+    print("Contraction Hierarchies")
+    print("=======================")
+
+    try:
+        tree = input_weighted_tree()
+
+        print("\nContracting nodes...")
+        hierarchy = ContractionHierarchy.build(tree)
+        shortcuts = len(hierarchy.middle)
+        print(f"Hierarchy built with {shortcuts} shortcut edge(s)")
+
+        filename = input("\nSave hierarchy to file (leave blank to skip): ").strip()
+        if filename:
+            hierarchy.save(filename)
+
+        print("\nEnter queries, leave the start node blank to finish")
+        while True:
+            start = input("\nEnter start node: ")
+            if not start:
+                break
+            goal = input("Enter goal node: ")
+
+            stats = {}
+            path = hierarchy.query(start, goal, stats)
+
+            if path:
+                print("Path:", " -> ".join(path))
+                print("Cost:", stats['cost'])
+                print("Nodes settled:", stats['settled'])
+            else:
+                print("No path found between", start, "and", goal)
+
+    except ValueError as e:
+        print("\nError: Please enter valid numeric values for costs")
+    except Exception as e:
+        print("\nAn error occurred:", str(e))
+
+if __name__ == "__main__":
+    main()
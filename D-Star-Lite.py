@@ -0,0 +1,176 @@
+import heapq
+
+class DStarLite:
+    # Incremental planner (D* Lite): searches backward from the goal and keeps
+    # g/rhs values between calls, so after an edge change only the nodes whose
+    # distance to the goal is affected are processed again
+    def __init__(self, start, goal, heuristic=None):
+        self.successors = {}    # node -> {child: cost}
+        self.predecessors = {}  # node -> {parent: cost}
+        self.start = start
+        self.goal = goal
+        # heuristic(a, b) must be a consistent estimate, zero by default
+        self.heuristic = heuristic or (lambda a, b: 0)
+
+        self.g = {}
+        self.rhs = {goal: 0}
+        self.km = 0
+        self.last_start = start
+
+        self.queue = []      # (key, node) entries, possibly stale
+        self.queued = {}     # node -> key of its live entry
+        self.expanded = 0
+        self._insert(goal, self._calculate_key(goal))
+
+        self._add_node(start)
+        self._add_node(goal)
+
+    def _add_node(self, node):
+        self.successors.setdefault(node, {})
+        self.predecessors.setdefault(node, {})
+
+    def _calculate_key(self, node):
+        best = min(self.g.get(node, float('inf')), self.rhs.get(node, float('inf')))
+        return (best + self.heuristic(self.start, node) + self.km, best)
+
+    def _insert(self, node, key):
+        self.queued[node] = key
+        heapq.heappush(self.queue, (key, node))
+
+    def _top(self):
+        # Drop entries for nodes that were removed or re-keyed since
+        while self.queue and self.queued.get(self.queue[0][1]) != self.queue[0][0]:
+            heapq.heappop(self.queue)
+        if self.queue:
+            return self.queue[0]
+        return (float('inf'), float('inf')), None
+
+    def _update_vertex(self, node):
+        if node != self.goal:
+            best = float('inf')
+            for child, cost in self.successors[node].items():
+                best = min(best, cost + self.g.get(child, float('inf')))
+            self.rhs[node] = best
+        self.queued.pop(node, None)
+        if self.g.get(node, float('inf')) != self.rhs.get(node, float('inf')):
+            self._insert(node, self._calculate_key(node))
+
+    def _compute_shortest_path(self):
+        g = self.g
+        rhs = self.rhs
+        while True:
+            top_key, node = self._top()
+            start_g = g.get(self.start, float('inf'))
+            if top_key >= self._calculate_key(self.start) and rhs.get(self.start, float('inf')) == start_g:
+                break
+
+            heapq.heappop(self.queue)
+            del self.queued[node]
+            self.expanded += 1
+
+            new_key = self._calculate_key(node)
+            if top_key < new_key:
+                self._insert(node, new_key)
+            elif g.get(node, float('inf')) > rhs.get(node, float('inf')):
+                g[node] = rhs[node]
+                for parent in self.predecessors[node]:
+                    self._update_vertex(parent)
+            else:
+                g[node] = float('inf')
+                self._update_vertex(node)
+                for parent in self.predecessors[node]:
+                    self._update_vertex(parent)
+
+    def update_edge(self, u, v, cost):
+        # Add the edge u -> v or change its cost; cost None removes it.
+        # Costs must be positive: on a zero-cost cycle a raised cost can leave
+        # nodes supporting each other's stale g values, which never look
+        # inconsistent and so are never repaired.
+        if cost is not None and cost <= 0:
+            raise ValueError(f"Edge costs must be positive, got {cost}")
+        self._add_node(u)
+        self._add_node(v)
+        if cost is None:
+            self.successors[u].pop(v, None)
+            self.predecessors[v].pop(u, None)
+        else:
+            self.successors[u][v] = cost
+            self.predecessors[v][u] = cost
+        self._update_vertex(u)
+
+    def add_edge(self, u, v, cost=1):
+        self.update_edge(u, v, cost)
+
+    def move_start(self, node):
+        # The robot moved: shift the key modifier instead of re-keying the queue
+        self._add_node(node)
+        self.km += self.heuristic(self.last_start, node)
+        self.last_start = node
+        self.start = node
+
+    def plan(self):
+        # Repairs the search state and returns the path from start to goal.
+        # self.expanded counts the nodes processed by this call.
+        self.expanded = 0
+        self._compute_shortest_path()
+
+        if self.g.get(self.start, float('inf')) == float('inf'):
+            return None
+
+        path = [self.start]
+        current = self.start
+        while current != self.goal:
+            best_child = None
+            best = float('inf')
+            for child, cost in self.successors[current].items():
+                if cost + self.g.get(child, float('inf')) < best:
+                    best = cost + self.g.get(child, float('inf'))
+                    best_child = child
+            if best_child is None or len(path) > len(self.successors):
+                return None
+            path.append(best_child)
+            current = best_child
+        return path
+
+def main():
+    print("D* Lite Incremental Planner")
+    print("===========================")
+
+    try:
+        m = int(input("Enter the number of edges: "))
+        edges = []
+        for _ in range(m):
+            edge = input("Enter edge (format: node1 node2 cost): ").split()
+            edges.append((edge[0], edge[1], int(edge[2])))
+
+        start = input("Enter the start node: ")
+        goal = input("Enter the goal node: ")
+
+        planner = DStarLite(start, goal)
+        for u, v, cost in edges:
+            planner.add_edge(u, v, cost)
+
+        while True:
+            path = planner.plan()
+            if path:
+                print("\nPath found:", " -> ".join(path))
+            else:
+                print("\nNo path found.")
+            print("Nodes expanded:", planner.expanded)
+
+            change = input("\nChange an edge (node1 node2 cost, 'none' as cost removes it), blank to finish: ").split()
+            if not change:
+                break
+            if len(change) != 3:
+                print("Invalid format. Please use 'node1 node2 cost'")
+                continue
+            u, v, cost = change
+            planner.update_edge(u, v, None if cost.lower() == 'none' else int(cost))
+
+    except ValueError as e:
+        print(f"Please enter positive numeric values for costs ({e})")
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,8 @@
+import time
+from array import array
+
+from graph_storage import NodeTable
+
 class Node:
     def __init__(self, value):
         self.left = None
@@ -5,37 +10,282 @@ class Node:
         self.val = value
 
 def inorder(root):
-    result = []
-    if root:
-        # Traverse left
-        result.extend(inorder(root.left))
-        # Traverse root
-        result.append(root.val)
-        # Traverse right
-        result.extend(inorder(root.right))
-    return result
+    return list(iter_inorder(root))
 
 def preorder(root):
-    result = []
-    if root:
-        # Traverse root
-        result.append(root.val)
-        # Traverse left
-        result.extend(preorder(root.left))
-        # Traverse right
-        result.extend(preorder(root.right))
-    return result
+    return list(iter_preorder(root))
 
 def postorder(root):
-    result = []
-    if root:
+    return list(iter_postorder(root))
+
+def iter_inorder(root):
+    # Explicit stack of the nodes whose left subtree is being walked
+    stack = []
+    node = root
+    while stack or node:
         # Traverse left
-        result.extend(postorder(root.left))
-        # Traverse right
-        result.extend(postorder(root.right))
+        while node:
+            stack.append(node)
+            node = node.left
         # Traverse root
-        result.append(root.val)
-    return result
+        node = stack.pop()
+        yield node.val
+        # Traverse right
+        node = node.right
+
+def iter_preorder(root):
+    stack = [root] if root else []
+    while stack:
+        node = stack.pop()
+        yield node.val
+        # Push right first so the left subtree is walked first
+        if node.right:
+            stack.append(node.right)
+        if node.left:
+            stack.append(node.left)
+
+def iter_postorder(root):
+    # A node is emitted once its right subtree was the last thing finished
+    stack = []
+    node = root
+    last = None
+    while stack or node:
+        if node:
+            stack.append(node)
+            node = node.left
+        else:
+            top = stack[-1]
+            if top.right and last is not top.right:
+                node = top.right
+            else:
+                yield top.val
+                last = stack.pop()
+
+def _morris(walk):
+    # Morris traversals thread right pointers temporarily. If the consumer
+    # stops early, finish the walk silently so the tree is restored.
+    def traversal(root):
+        steps = walk(root)
+        try:
+            for value in steps:
+                yield value
+        finally:
+            for _ in steps:
+                pass
+    return traversal
+
+def _predecessor(node):
+    # Rightmost node of the left subtree, stopping at an existing thread
+    pred = node.left
+    while pred.right and pred.right is not node:
+        pred = pred.right
+    return pred
+
+@_morris
+def morris_inorder(root):
+    node = root
+    while node:
+        if node.left is None:
+            yield node.val
+            node = node.right
+        else:
+            pred = _predecessor(node)
+            if pred.right is None:
+                pred.right = node
+                node = node.left
+            else:
+                pred.right = None
+                yield node.val
+                node = node.right
+
+@_morris
+def morris_preorder(root):
+    node = root
+    while node:
+        if node.left is None:
+            yield node.val
+            node = node.right
+        else:
+            pred = _predecessor(node)
+            if pred.right is None:
+                yield node.val
+                pred.right = node
+                node = node.left
+            else:
+                pred.right = None
+                node = node.right
+
+def _reverse_right_chain(start, end):
+    # Reverses the right pointers along the chain start -> ... -> end
+    prev, node = None, start
+    while prev is not end:
+        node.right, prev, node = prev, node, node.right
+
+@_morris
+def morris_postorder(root):
+    # Threads through a dummy parent; when a thread is removed, the right
+    # chain of the left subtree is emitted bottom-up by reversing it in place
+    dummy = Node(None)
+    dummy.left = root
+    node = dummy
+    while node:
+        if node.left is None:
+            node = node.right
+        else:
+            pred = _predecessor(node)
+            if pred.right is None:
+                pred.right = node
+                node = node.left
+            else:
+                pred.right = None
+                _reverse_right_chain(node.left, pred)
+                chain = pred
+                while chain:
+                    yield chain.val
+                    chain = chain.right
+                _reverse_right_chain(pred, node.left)
+                node = node.right
+
+class ArrayTree:
+    # Struct-of-arrays binary tree. Node i holds the value values.names[val[i]]
+    # and children left[i] and right[i], -1 meaning none. A complete tree can
+    # use the implicit heap layout instead, with children at 2i + 1 and 2i + 2
+    # and no link arrays at all.
+    def __init__(self, implicit=False):
+        self.values = NodeTable()
+        self.val = array('i')
+        self.left = array('i')
+        self.right = array('i')
+        self.implicit = implicit
+        self.root = -1
+        self.ignored = 0   # edges dropped because the parent had two children
+    
+    def __len__(self):
+        return len(self.val)
+    
+    @classmethod
+    def from_edges(cls, pairs):
+        # Same rules as build_tree: the first parent is the root, the first
+        # child goes left and the second right. Node ids are the interned
+        # value ids, so val[i] == i.
+        tree = cls()
+        values = tree.values
+        left = tree.left
+        right = tree.right
+        for parent_val, child_val in pairs:
+            parent = values.intern(parent_val)
+            child = values.intern(child_val)
+            while len(left) < len(values):
+                tree.val.append(len(left))
+                left.append(-1)
+                right.append(-1)
+            if tree.root == -1:
+                tree.root = parent
+            if left[parent] == -1:
+                left[parent] = child
+            elif right[parent] == -1:
+                right[parent] = child
+            else:
+                tree.ignored += 1
+        return tree
+    
+    @classmethod
+    def from_edge_file(cls, path):
+        # One 'parent child' pair per line
+        with open(path) as f:
+            return cls.from_edges(line.split() for line in f if line.strip())
+    
+    @classmethod
+    def complete(cls, values):
+        # Level-order values of a complete tree in the implicit heap layout
+        tree = cls(implicit=True)
+        tree.val.extend(tree.values.intern(value) for value in values)
+        tree.root = 0 if len(tree.val) else -1
+        return tree
+    
+    def _links(self):
+        if self.implicit:
+            n = len(self.val)
+            return ((lambda i: 2 * i + 1 if 2 * i + 1 < n else -1),
+                    (lambda i: 2 * i + 2 if 2 * i + 2 < n else -1))
+        return self.left.__getitem__, self.right.__getitem__
+    
+    def inorder(self):
+        left, right = self._links()
+        names = self.values.names
+        val = self.val
+        stack = array('i')
+        node = self.root
+        while stack or node != -1:
+            while node != -1:
+                stack.append(node)
+                node = left(node)
+            node = stack.pop()
+            yield names[val[node]]
+            node = right(node)
+    
+    def preorder(self):
+        left, right = self._links()
+        names = self.values.names
+        val = self.val
+        stack = array('i', [self.root] if self.root != -1 else [])
+        while stack:
+            node = stack.pop()
+            yield names[val[node]]
+            if right(node) != -1:
+                stack.append(right(node))
+            if left(node) != -1:
+                stack.append(left(node))
+    
+    def postorder(self):
+        left, right = self._links()
+        names = self.values.names
+        val = self.val
+        stack = array('i')
+        node = self.root
+        last = -1
+        while stack or node != -1:
+            if node != -1:
+                stack.append(node)
+                node = left(node)
+            else:
+                top = stack[-1]
+                if right(top) != -1 and last != right(top):
+                    node = right(top)
+                else:
+                    yield names[val[top]]
+                    last = stack.pop()
+
+ENGINES = {
+    'stack': (iter_inorder, iter_preorder, iter_postorder),
+    'morris': (morris_inorder, morris_preorder, morris_postorder),
+}
+
+def benchmark(sizes=(100000, 1000000)):
+    # Times every engine on left-skewed and balanced trees; linear engines
+    # should take about ten times longer for ten times the nodes
+    for n in sizes:
+        nodes = [Node(i) for i in range(n)]
+        for i in range(n - 1):
+            nodes[i].left = nodes[i + 1]
+        skewed = nodes[0]
+        
+        nodes = [Node(i) for i in range(n)]
+        for i in range(n):
+            if 2 * i + 1 < n:
+                nodes[i].left = nodes[2 * i + 1]
+            if 2 * i + 2 < n:
+                nodes[i].right = nodes[2 * i + 2]
+        balanced = nodes[0]
+        
+        for shape, root in (("skewed", skewed), ("balanced", balanced)):
+            for engine, traversals in ENGINES.items():
+                for name, traversal in zip(("inorder", "preorder", "postorder"), traversals):
+                    begin = time.perf_counter()
+                    for _ in traversal(root):
+                        pass
+                    elapsed = time.perf_counter() - begin
+                    print(f"{n:>8} {shape:>8} {engine:>6} {name:>9}: {elapsed:.3f}s")
 
 def build_tree():
     # Get number of nodes
@@ -90,34 +340,41 @@ def main():
     # Build tree from user input
     root = build_tree()
     
+    print("\nSelect traversal engine:")
+    print("1. Explicit stack")
+    print("2. Morris (O(1) extra space)")
+    engine = 'morris' if input("Enter your choice (1-2): ") == '2' else 'stack'
+    inorder_walk, preorder_walk, postorder_walk = ENGINES[engine]
+    
     while True:
         print("\nSelect traversal method:")
         print("1. Inorder traversal (Left -> Root -> Right)")
         print("2. Preorder traversal (Root -> Left -> Right)")
         print("3. Postorder traversal (Left -> Right -> Root)")
         print("4. Exit")
+        print("5. Benchmark traversal engines")
         
-        choice = input("Enter your choice (1-4): ")
+        choice = input("Enter your choice (1-5): ")
         
         if choice == '1':
-            result = inorder(root)
             print("\nInorder traversal:")
-            print(" -> ".join(result))
+            print(" -> ".join(inorder_walk(root)))
         
         elif choice == '2':
-            result = preorder(root)
             print("\nPreorder traversal:")
-            print(" -> ".join(result))
+            print(" -> ".join(preorder_walk(root)))
         
         elif choice == '3':
-            result = postorder(root)
             print("\nPostorder traversal:")
-            print(" -> ".join(result))
+            print(" -> ".join(postorder_walk(root)))
         
         elif choice == '4':
             print("Exiting program...")
             break
         
+        elif choice == '5':
+            benchmark()
+        
         else:
             print("Invalid choice. Please try again.")
 
@@ -1,30 +1,60 @@
-from collections import defaultdict
+from graph_storage import AdjacencyLists, ComponentIndex, NodeTable
 
 class Tree:
     def __init__(self):
-        self.graph = defaultdict(list)
+        self.nodes = NodeTable()
+        self.adjacency = AdjacencyLists(self.nodes)   # live id adjacency
+        self.components = ComponentIndex(self.nodes)
     
     def add_edge(self, u, v):
-        self.graph[u].append(v)
-        self.graph[v].append(u)
+        # Both directions are appended to the id arrays in place, so
+        # traversals need no rebuild
+        u = self.nodes.intern(u)
+        v = self.nodes.intern(v)
+        self.adjacency.add_edge(u, v)
+        self.adjacency.add_edge(v, u)
+        self.components.union_ids(u, v)
     
     def dfs(self, start_node):
-        if start_node not in self.graph:
+        if self.adjacency.id_of(start_node) is None:
             return f"Node {start_node} not found in the tree"
         
-        visited = set()
-        result = []
+        return list(self.iter_dfs(start_node))
+    
+    def iter_dfs(self, start_node, events=False):
+        # Explicit-stack DFS that visits nodes in the same order as the
+        # recursive version, yielding each node as it is discovered. With
+        # events=True it yields ('pre', node) and ('post', node) pairs instead.
+        start = self.adjacency.id_of(start_node)
+        if start is None:
+            return
+        
+        # Traverse the live id arrays, translating to names only when
+        # yielding. Only reached ids are marked, so the generator costs
+        # nothing per node outside the start's component, and edges added
+        # while it is suspended never index past the end of visited.
+        names = self.nodes.names
+        lists = self.adjacency.lists
+        
+        visited = {start}
+        yield ('pre', names[start]) if events else names[start]
         
-        def dfs_util(node):
-            visited.add(node)
-            result.append(node)
+        # Each stack entry keeps its position in the node's neighbor array
+        stack = [(start, iter(lists[start]))]
+        
+        while stack:
+            node, neighbors = stack[-1]
             
-            for neighbor in self.graph[node]:
+            for neighbor in neighbors:
                 if neighbor not in visited:
-                    dfs_util(neighbor)
-        
-        dfs_util(start_node)
-        return result
+                    visited.add(neighbor)
+                    yield ('pre', names[neighbor]) if events else names[neighbor]
+                    stack.append((neighbor, iter(lists[neighbor])))
+                    break
+            else:
+                stack.pop()
+                if events:
+                    yield ('post', names[node])
 
 def main():
     tree = Tree()    
@@ -1,3 +1,9 @@
+import random
+import time
+from collections import OrderedDict
+
+from search_observers import ObserverGroup, SearchObserver, SearchStats
+
 class Node:
     def __init__(self, name, cost=0, heuristic=0):
         self.name = name
@@ -5,20 +11,100 @@ class Node:
         self.heuristic = heuristic
         self.f = cost + heuristic  # Total cost
 
-def ida_star(start, goal, graph, heuristic):
+class ThresholdPrinter(SearchObserver):
+    # Prints each threshold and the path left after its iteration
+    def on_iteration(self, bound):
+        print(f"\nCurrent threshold: {bound}")
+    
+    def on_iteration_end(self, bound, path):
+        print(f"Path traversed in this iteration: {' -> '.join(path)}")
+
+class GrowthHistogram(SearchObserver):
+    # IDA*_CR threshold selection. The f-costs cut off during an iteration
+    # are counted in a fixed number of buckets spanning (threshold,
+    # 2 * threshold], and the next threshold is the largest cut-off f in the
+    # first bucket where the cut-off count reaches (growth - 1) times the
+    # nodes expanded, so each iteration does roughly growth times the work of
+    # the last instead of adding a handful of nodes.
+    def __init__(self, growth=2, buckets=50):
+        self.growth = growth
+        self.buckets = buckets
+    
+    def on_iteration(self, bound):
+        self.threshold = bound
+        self.width = max(bound, 1) / self.buckets
+        self.counts = [0] * self.buckets
+        self.largest = [None] * self.buckets
+        self.beyond = float('inf')   # smallest cut-off f past the last bucket
+        self.expanded = 0
+    
+    def on_expand(self, node, depth):
+        self.expanded += 1
+    
+    def on_prune(self, node, f):
+        i = int((f - self.threshold) / self.width)
+        if i < self.buckets:
+            self.counts[i] += 1
+            if self.largest[i] is None or f > self.largest[i]:
+                self.largest[i] = f
+        elif f < self.beyond:
+            self.beyond = f
+    
+    def next_threshold(self):
+        target = max(1, (self.growth - 1) * self.expanded)
+        seen = 0
+        chosen = None
+        for count, largest in zip(self.counts, self.largest):
+            if count:
+                seen += count
+                chosen = largest
+                if seen >= target:
+                    break
+        return self.beyond if chosen is None else chosen
+
+def ida_star(start, goal, graph, heuristic, observer=None, policy='min', epsilon=1, growth=2):
+    # policy picks each next threshold:
+    #   'min'     - the smallest f that exceeded the last one (optimal)
+    #   'cr'      - IDA*_CR growth, see GrowthHistogram; the cost is at most
+    #               the final threshold, while the last failed iteration's
+    #               smallest exceeded f is a lower bound on the optimum
+    #   'epsilon' - at least epsilon above the last threshold; the cost is
+    #               less than the optimum plus epsilon
+    # 'cr' needs the cut-off f values, so it always runs the observed search.
     threshold = heuristic[start]
     path = [start]
     
+    histogram = None
+    if policy == 'cr':
+        histogram = GrowthHistogram(growth)
+        observer = histogram if observer is None else ObserverGroup(observer, histogram)
+    elif policy not in ('min', 'epsilon'):
+        raise ValueError(f"Unknown threshold policy: {policy}")
+    
     while True:
-        print(f"\nCurrent threshold: {threshold}")
-        temp = search(path, 0, threshold, goal, graph, heuristic)
-        print(f"Path traversed in this iteration: {' -> '.join(path)}")
+        if observer is None:
+            temp = search(path, 0, threshold, goal, graph, heuristic)
+        else:
+            observer.on_iteration(threshold)
+            temp = observed_search(path, 0, threshold, goal, graph, heuristic, observer)
+            if temp == "FOUND":
+                observer.on_found(goal, len(path) - 1)
+            observer.on_iteration_end(threshold, path)
         
         if temp == "FOUND":
             return path
         if temp == float('inf'):
             return None  # No path found
-        threshold = temp  # Update threshold for next iteration
+        
+        # Update threshold for next iteration
+        if histogram is not None:
+            threshold = histogram.next_threshold()
+        elif policy == 'epsilon':
+            threshold = max(temp, threshold + epsilon)
+        else:
+            threshold = temp
+        if observer is not None:
+            observer.on_threshold(threshold)
 
 def search(path, g, threshold, goal, graph, heuristic):
     current = path[-1]
@@ -44,31 +130,261 @@ def search(path, g, threshold, goal, graph, heuristic):
     
     return min_threshold  # Return the minimum threshold found
 
-# Input graph
-graph = {}
-heuristic = {}
+def observed_search(path, g, threshold, goal, graph, heuristic, observer):
+    # Same as search, reporting visits and expansions to the observer
+    current = path[-1]
+    observer.on_visit(current, len(path) - 1)
+    f = g + heuristic[current]
+    
+    if f > threshold:
+        observer.on_prune(current, f)
+        return f
+    
+    if current == goal:
+        return "FOUND"
+    
+    min_threshold = float('inf')
+    
+    observer.on_expand(current, len(path) - 1)
+    for neighbor, cost in graph[current].items():
+        if neighbor not in path:
+            path.append(neighbor)
+            temp = observed_search(path, g + cost, threshold, goal, graph, heuristic, observer)
+            if temp == "FOUND":
+                return "FOUND"
+            if temp < min_threshold:
+                min_threshold = temp
+            path.pop()
+    
+    return min_threshold
+
+class EnhancedIDAStar:
+    # IDA* with a path set for constant-time cycle checks and a bounded
+    # transposition table. For every state the table keeps the best lower
+    # bound on its cost to the goal backed up from earlier searches (never
+    # below the heuristic), plus the iteration and g at which it was last
+    # searched in full. The bound carries over to later iterations, so a
+    # subtree that already failed is cut at its root; within an iteration a
+    # transposition reached again with no smaller g is skipped. When the table
+    # is full the least recently used state is dropped, which only costs
+    # re-expansion.
+    def __init__(self, graph, heuristic, table_size=100000, order_moves=False):
+        self.graph = graph
+        self.heuristic = heuristic
+        self.table_size = table_size
+        self.order_moves = order_moves
+        self.table = OrderedDict()   # state -> (bound, iteration, g, excess)
+        self.iteration = 0
+        self.stats = {}
+    
+    def _bound(self, state):
+        entry = self.table.get(state)
+        if entry is None:
+            return self.heuristic[state]
+        return entry[0]
+    
+    def _store(self, state, bound, g, excess):
+        table = self.table
+        table[state] = (bound, self.iteration, g, excess)
+        table.move_to_end(state)
+        if len(table) > self.table_size:
+            table.popitem(last=False)
+    
+    def search(self, start, goal):
+        # Returns the path, or None; self.stats describes the run
+        self.iteration = 0
+        self.expanded = 0
+        self.transpositions = 0
+        self.cost = None
+        iterations = []
+        self.stats = {'iterations': iterations}
+        
+        # No simple path costs more than all the edges together. Plain IDA*
+        # stops when its frontier runs out, but backed-up bounds on a cycle
+        # keep growing with the threshold, so an unreachable goal is detected
+        # by the threshold passing this total instead.
+        longest = sum(sum(edges.values()) for edges in self.graph.values())
+        
+        path = [start]
+        on_path = {start}
+        threshold = self._bound(start)
+        started = time.perf_counter()
+        
+        while True:
+            self.iteration += 1
+            expanded = self.expanded
+            result = self._search(path, on_path, 0, threshold, goal)
+            iterations.append({'threshold': threshold, 'expanded': self.expanded - expanded})
+            
+            if result is None or result[0] > longest:
+                break
+            threshold = result[0]
+        
+        self.stats.update(expanded=self.expanded, transpositions=self.transpositions,
+                          table=len(self.table), cost=self.cost,
+                          seconds=time.perf_counter() - started)
+        return path if result is None else None
+    
+    def _search(self, path, on_path, g, threshold, goal):
+        # Returns None once the goal is found, otherwise the smallest f that
+        # exceeded the threshold and a lower bound on the cost from here to
+        # the goal. Neighbors skipped for being on the path still count
+        # toward the bound, so it holds whatever path leads to this state.
+        current = path[-1]
+        h = self._bound(current)
+        f = g + h
+        
+        if f > threshold:
+            return f, h
+        
+        if current == goal:
+            self.cost = g
+            return None
+        
+        entry = self.table.get(current)
+        if entry is not None and entry[1] == self.iteration and entry[2] <= g:
+            self.transpositions += 1
+            self.table.move_to_end(current)
+            return g + entry[3], entry[0]
+        
+        self.expanded += 1
+        next_f = float('inf')
+        bound = float('inf')
+        
+        neighbors = self.graph[current].items()
+        if self.order_moves:
+            bound_of = self._bound
+            neighbors = sorted(neighbors, key=lambda item: item[1] + bound_of(item[0]))
+        
+        for neighbor, cost in neighbors:
+            if neighbor in on_path:
+                if cost + self._bound(neighbor) < bound:
+                    bound = cost + self._bound(neighbor)
+                continue
+            
+            path.append(neighbor)
+            on_path.add(neighbor)
+            result = self._search(path, on_path, g + cost, threshold, goal)
+            if result is None:
+                return None
+            path.pop()
+            on_path.discard(neighbor)
+            
+            if result[0] < next_f:
+                next_f = result[0]
+            if cost + result[1] < bound:
+                bound = cost + result[1]
+        
+        if bound < h:
+            bound = h
+        self._store(current, bound, g, next_f - g)
+        return next_f, bound
+
+def _grid_graph(size, seed=0, real=False):
+    # Undirected 4-connected grid with random edge costs: every cell can be
+    # reached by many paths, so plain IDA* keeps re-expanding the same cells.
+    # Real-valued costs make nearly every f distinct.
+    rng = random.Random(seed)
+    graph = {(x, y): {} for x in range(size) for y in range(size)}
+    for x, y in graph:
+        for neighbor in ((x + 1, y), (x, y + 1)):
+            if neighbor in graph:
+                cost = rng.uniform(1, 3) if real else rng.randint(1, 3)
+                graph[(x, y)][neighbor] = cost
+                graph[neighbor][(x, y)] = cost
+    return graph
+
+def benchmark(size=12):
+    # Compares plain and enhanced IDA* on a grid with a Manhattan heuristic.
+    # Plain IDA* grows exponentially with the grid, so keep size moderate.
+    # Run it with search_observers.load_script('IDA-Star').benchmark().
+    graph = _grid_graph(size)
+    goal = (size - 1, size - 1)
+    heuristic = {(x, y): abs(goal[0] - x) + abs(goal[1] - y) for x, y in graph}
+    
+    print(f"IDA* on a {size}x{size} grid")
+    print(f"{'search':>28} {'cost':>5} {'expanded':>9} {'seconds':>8}")
+    
+    stats = SearchStats()
+    begin = time.perf_counter()
+    path = ida_star((0, 0), goal, graph, heuristic, stats)
+    elapsed = time.perf_counter() - begin
+    cost = sum(graph[a][b] for a, b in zip(path, path[1:]))
+    print(f"{'plain':>28} {cost:>5} {stats.expanded:>9} {elapsed:>8.3f}")
+    
+    for label, order_moves in (("transposition table", False), ("table and move ordering", True)):
+        engine = EnhancedIDAStar(graph, heuristic, order_moves=order_moves)
+        engine.search((0, 0), goal)
+        print(f"{label:>28} {engine.stats['cost']:>5} {engine.stats['expanded']:>9} {engine.stats['seconds']:>8.3f}")
+
+def benchmark_policies(size=5, epsilon=1):
+    # Threshold policies on a grid with real-valued costs, where the 'min'
+    # policy needs an iteration for almost every distinct f value.
+    # Run it with search_observers.load_script('IDA-Star').benchmark_policies().
+    graph = _grid_graph(size, real=True)
+    goal = (size - 1, size - 1)
+    heuristic = {(x, y): abs(goal[0] - x) + abs(goal[1] - y) for x, y in graph}
+    
+    print(f"IDA* threshold policies on a {size}x{size} grid with real-valued costs")
+    print(f"{'policy':>8} {'iterations':>10} {'expanded':>9} {'largest':>8} {'cost':>7} {'seconds':>8}")
+    for policy in ('min', 'cr', 'epsilon'):
+        stats = SearchStats()
+        begin = time.perf_counter()
+        path = ida_star((0, 0), goal, graph, heuristic, stats, policy, epsilon)
+        elapsed = time.perf_counter() - begin
+        cost = sum(graph[a][b] for a, b in zip(path, path[1:]))
+        largest = max(iteration['expanded'] for iteration in stats.iterations)
+        print(f"{policy:>8} {len(stats.iterations):>10} {stats.expanded:>9} {largest:>8} {cost:>7.3f} {elapsed:>8.3f}")
+
+def main():
+    # Input graph
+    graph = {}
+    heuristic = {}
+
+    n = int(input("Enter the number of nodes: "))
+
+    for _ in range(n):
+        node = input("Enter node name: ")
+        graph[node] = {}
+        heuristic[node] = int(input(f"Enter heuristic value for node {node}: "))
+
+    m = int(input("Enter the number of edges: "))
 
-n = int(input("Enter the number of nodes: "))
+    for _ in range(m):
+        edge = input("Enter edge (format: node1 node2 cost): ").split()
+        node1, node2, cost = edge[0], edge[1], int(edge[2])
+        graph[node1][node2] = cost
+        graph[node2][node1] = cost  # Assuming undirected graph
 
-for _ in range(n):
-    node = input("Enter node name: ")
-    graph[node] = {}
-    heuristic[node] = int(input(f"Enter heuristic value for node {node}: "))
+    start = input("Enter the start node: ")
+    goal = input("Enter the goal node: ")
 
-m = int(input("Enter the number of edges: "))
+    mode = input("Search mode (1 = IDA*, 2 = enhanced IDA*, 3 = enhanced with move ordering): ").strip()
 
-for _ in range(m):
-    edge = input("Enter edge (format: node1 node2 cost): ").split()
-    node1, node2, cost = edge[0], edge[1], int(edge[2])
-    graph[node1][node2] = cost
-    graph[node2][node1] = cost  # Assuming undirected graph
+    policy = 'min'
+    epsilon = 1
+    if mode not in ('2', '3'):
+        policy = input("Threshold policy (min, cr, epsilon; blank for min): ").strip() or 'min'
+        if policy == 'epsilon':
+            epsilon = float(input("Enter epsilon: "))
 
-start = input("Enter the start node: ")
-goal = input("Enter the goal node: ")
+    if mode in ('2', '3'):
+        engine = EnhancedIDAStar(graph, heuristic, order_moves=mode == '3')
+        path = engine.search(start, goal)
+        for iteration in engine.stats['iterations']:
+            print(f"Threshold {iteration['threshold']}: {iteration['expanded']} nodes expanded")
+        print("Transpositions skipped:", engine.stats['transpositions'])
+    else:
+        stats = SearchStats()
+        path = ida_star(start, goal, graph, heuristic, ObserverGroup(ThresholdPrinter(), stats), policy, epsilon)
+        print()
+        for iteration in stats.iterations:
+            print(f"Threshold {iteration['bound']}: {iteration['expanded']} nodes expanded")
 
-path = ida_star(start, goal, graph, heuristic)
+    if path:
+        print("\nFinal path found:", " -> ".join(path))
+    else:
+        print("No path found.")
 
-if path:
-    print("\nFinal path found:", " -> ".join(path))
-else:
-    print("No path found.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
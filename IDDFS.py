@@ -1,5 +1,17 @@
+from graph_storage import CSRGraph, NodeTable
+from search_observers import SearchObserver
+
+class TracePrinter(SearchObserver):
+    # Prints every iteration and visit as the traversal happens
+    def on_iteration(self, bound):
+        print(f"\nSearching at depth limit: {bound}")
+    
+    def on_visit(self, node, depth):
+        print(f"Visiting depth {depth}: {node}")
+
 def get_tree_input():
     tree = {}
+    nodes = NodeTable()
     
     # Get number of nodes
     while True:
@@ -20,7 +32,8 @@ def get_tree_input():
                     print("Invalid format. Please enter two nodes separated by space")
                     continue
                 
-                node1, node2 = edge
+                # Share one string object per node name across all edges
+                node1, node2 = (nodes.canonical(node) for node in edge)
                 
                 # Initialize empty lists for new nodes
                 if node1 not in tree:
@@ -36,43 +49,113 @@ def get_tree_input():
     
     return tree
 
-def depth_limited_search(tree, current_node, limit, depth, visited, path):
-    if depth > limit:
-        return False
-    
-    visited.add(current_node)
+def depth_limited_search(tree, current_node, limit, depth, visited, path, observer=None):
+    # tree is a CSRGraph, nodes are its integer ids and visited is a bytearray.
+    # Returns True when the cutoff was hit: a node at the depth limit still
+    # had unvisited children, so a deeper iteration can find more nodes.
+    # Without an observer the recursion makes no event calls at all.
+    if observer is None:
+        return _depth_limited_search(tree, current_node, limit, depth, visited, path)
+    return _observed_depth_limited_search(tree, current_node, limit, depth, visited, path, observer)
+
+def _depth_limited_search(tree, current_node, limit, depth, visited, path):
+    visited[current_node] = 1
     path.append(current_node)
-    print(f"Visiting depth {depth}: {current_node}")
     
-    if current_node not in tree:
-        path.pop()
-        return False
+    cutoff = False
+    for i in range(tree.offsets[current_node], tree.offsets[current_node + 1]):
+        neighbor = tree.targets[i]
+        if not visited[neighbor]:
+            if depth == limit:
+                cutoff = True
+            elif _depth_limited_search(tree, neighbor, limit, depth + 1, visited, path):
+                cutoff = True
+    
+    return cutoff
+
+def _observed_depth_limited_search(tree, current_node, limit, depth, visited, path, observer):
+    visited[current_node] = 1
+    path.append(current_node)
+    observer.on_visit(tree.names[current_node], depth)
+    if depth < limit:
+        observer.on_expand(tree.names[current_node], depth)
     
-    for neighbor in tree[current_node]:
-        if neighbor not in visited:
-            if depth_limited_search(tree, neighbor, limit, depth + 1, visited, path):
-                return True
+    cutoff = False
+    for i in range(tree.offsets[current_node], tree.offsets[current_node + 1]):
+        neighbor = tree.targets[i]
+        if not visited[neighbor]:
+            if depth == limit:
+                cutoff = True
+            elif _observed_depth_limited_search(tree, neighbor, limit, depth + 1, visited, path, observer):
+                cutoff = True
     
-    return True
+    return cutoff
+
+def extend_frontier(tree, sequence, limit, visited, observer=None):
+    # Builds the next iteration's visiting order from the previous one by
+    # splicing the unvisited children of every node at the old cutoff right
+    # after it. On trees this is exactly what a fresh depth-limited search
+    # would produce; on graphs with shared nodes a node keeps the place where
+    # a shallower iteration first reached it. Returns the new order and the
+    # nodes added at the new limit.
+    extended = []
+    added = []
+    for node, depth in sequence:
+        extended.append((node, depth))
+        if depth == limit - 1:
+            if observer is not None:
+                observer.on_expand(tree.names[node], depth)
+            for i in range(tree.offsets[node], tree.offsets[node + 1]):
+                neighbor = tree.targets[i]
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    extended.append((neighbor, limit))
+                    added.append(neighbor)
+                    if observer is not None:
+                        observer.on_visit(tree.names[neighbor], limit)
+    return extended, added
 
-def iterative_deepening_search(tree, root):
+def iterative_deepening_search(tree, root, cache_frontier=False, observer=None):
+    # Stops at the first depth limit whose iteration never hits the cutoff.
+    # With cache_frontier the previous iteration's order is reused, so each
+    # iteration only explores the one new level. Returns the visiting order
+    # of every iteration; pass a TracePrinter to watch it happen.
     max_depth = len(tree)
     levels = {}
+    graph = CSRGraph(tree)
+    root = graph.ids[root]
+    
+    visited = bytearray(len(graph))
+    sequence = [(root, 0)]
     
-    print("\nIDDFS Traversal:")
     for depth in range(max_depth):
-        print(f"\nSearching at depth limit: {depth}")
-        visited = set()
-        path = []
-        depth_limited_search(tree, root, depth, 0, visited, path)
+        if observer is not None:
+            observer.on_iteration(depth)
+        
+        if cache_frontier:
+            if depth == 0:
+                visited[root] = 1
+                if observer is not None:
+                    observer.on_visit(graph.names[root], 0)
+                added = [root]
+            else:
+                sequence, added = extend_frontier(graph, sequence, depth, visited, observer)
+            path = [node for node, _ in sequence]
+            cutoff = any(not visited[graph.targets[i]]
+                         for node in added
+                         for i in range(graph.offsets[node], graph.offsets[node + 1]))
+        else:
+            visited = bytearray(len(graph))
+            path = []
+            cutoff = depth_limited_search(graph, root, depth, 0, visited, path, observer)
         
-        if path:
-            levels[depth] = path.copy()
+        levels[depth] = [graph.names[node] for node in path]
+        if observer is not None:
+            observer.on_iteration_end(depth, levels[depth])
+        if not cutoff:
+            break
     
-    print("\nTree Traversal Summary:")
-    print(f"Total Levels = {len(levels)}")
-    for level, nodes in levels.items():
-        print(f"Level {level}: {' -> '.join(nodes)}")
+    return levels
 
 def main():
     # Get the tree structure
@@ -86,7 +169,13 @@ def main():
         print("Invalid start node. Please enter an existing node.")
     
     # Perform IDDFS
-    iterative_deepening_search(tree, start_node)
+    print("\nIDDFS Traversal:")
+    levels = iterative_deepening_search(tree, start_node, observer=TracePrinter())
+    
+    print("\nTree Traversal Summary:")
+    print(f"Total Levels = {len(levels)}")
+    for level, nodes in levels.items():
+        print(f"Level {level}: {' -> '.join(nodes)}")
     print("\nIDDFS traversal completed.")
 
 if __name__ == "__main__":
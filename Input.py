@@ -1,15 +1,18 @@
+from graph_storage import NodeTable
+
 def input_tree():
     tree = {}
+    nodes = NodeTable()  # names repeated across lines share one string
     n = int(input("Enter the number of nodes in the tree: "))
 
     print("Enter the tree structure:")
     for _ in range(n):
-        node = input("Enter node: ").strip()
+        node = nodes.canonical(input("Enter node: ").strip())
         children_input = input(f"Enter children of node '{node}' (comma separated, leave empty if none): ").strip()
         
         # Split and clean children
         if children_input:
-            children = [child.strip() for child in children_input.split(',')]
+            children = [nodes.canonical(child.strip()) for child in children_input.split(',')]
         else:
             children = []
         
@@ -17,6 +20,22 @@ def input_tree():
 
     return tree
 
+def input_weighted_tree():
+    tree = {}
+    nodes = NodeTable()  # one string object per node name
+    n = int(input("Enter number of nodes in the tree: "))
+    print("For each node, enter children in format: child:cost (comma-separated), or leave blank if none.")
+    for _ in range(n):
+        node = nodes.canonical(input("Node: "))
+        children_input = input(f"Children of {node}: ")
+        children = []
+        if children_input:
+            for child_pair in children_input.split(','):
+                child, cost = child_pair.strip().split(':')
+                children.append((nodes.canonical(child.strip()), int(cost)))
+        tree[node] = children
+    return tree
+
 
 def print_tree(tree, node, level=0):
     print(' ' * level + node)
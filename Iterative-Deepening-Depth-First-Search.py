@@ -1,55 +1,266 @@
-from collections import defaultdict
+import multiprocessing
+from collections import OrderedDict
+
+from graph_storage import AdjacencyLists, NodeTable
+from search_observers import SearchObserver
+
+class TranspositionTable:
+    # Largest remaining depth already searched below each node without
+    # finding the target. A node reached again with no more depth left cannot
+    # succeed either. Least recently used entries are evicted past capacity,
+    # which only costs re-exploration. Entries are only valid for the target
+    # they were recorded against, so every search entry point clears it.
+    def __init__(self, capacity=1000000):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def explored(self, node, remaining):
+        depth = self.entries.get(node)
+        if depth is not None and depth >= remaining:
+            self.entries.move_to_end(node)
+            return True
+        return False
+    
+    def store(self, node, remaining):
+        entries = self.entries
+        if entries.get(node, -1) < remaining:
+            entries[node] = remaining
+        entries.move_to_end(node)
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+    
+    def clear(self):
+        self.entries.clear()
+
+class VisitPrinter(SearchObserver):
+    # Prints each depth limit followed by the vertices it visits on one line
+    def on_iteration(self, bound):
+        print(f"\nDepth limit: {bound}")
+        print(f"Vertices visited: ", end="")
+    
+    def on_visit(self, node, depth):
+        print(node, end=" ")
 
 class Tree:
-    def __init__(self):
-        self.graph = defaultdict(list)
+    def __init__(self, table_size=1000000):
+        self.nodes = NodeTable()
+        self.adjacency = AdjacencyLists(self.nodes)   # live id adjacency
+        self.table = TranspositionTable(table_size)
     
     def add_edge(self, u, v):
-        self.graph[u].append(v)
+        # The edge is appended to u's id array in place, so searches never
+        # wait for a rebuild
+        u = self.nodes.intern(u)
+        v = self.nodes.intern(v)
+        self.adjacency.add_edge(u, v)
+    
+    def _lookup(self, source, target):
+        # Ids of the query names, looked up without interning them. An
+        # unknown target gets -1, which no node matches; an unknown source
+        # gets None, since without edges it reaches nothing but itself.
+        ids = self.nodes.ids
+        return ids.get(source), ids.get(target, -1)
     
     def depth_limited_search(self, source, target, max_depth):
+        source_id, target_id = self._lookup(source, target)
+        if source_id is None:
+            return source == target
+        self.table.clear()
+        return self._depth_limited_search(source_id, target_id, max_depth)
+    
+    def _depth_limited_search(self, source, target, max_depth):
         if source == target:
             return True
         
-        if max_depth <= 0:
+        if max_depth <= 0 or self.table.explored(source, max_depth):
             return False
-            
-        for neighbor in self.graph[source]:
-            if self.depth_limited_search(neighbor, target, max_depth - 1):
+        
+        for child in self.adjacency.lists[source]:
+            if self._depth_limited_search(child, target, max_depth - 1):
                 return True
         
+        self.table.store(source, max_depth)
         return False
     
-    def iterative_deepening_dfs(self, source, target, max_depth):
-        for depth in range(max_depth + 1):
-            print(f"\nDepth limit: {depth}")
-            print(f"Vertices visited: ", end="")
-            
-            self.visited = set()
-            
-            if self.depth_limited_search_with_print(source, target, depth):
-                print(f"\nTarget {target} found at depth {depth}")
-                return True
+    def split_frontier(self, source, target, max_depth, size):
+        # Expands the top of the search tree breadth-first until there are at
+        # least size (node, remaining depth) subtrees to hand out. A node met
+        # again with no more depth left is dropped. Returns the subtrees and
+        # whether the target was reached on the way.
+        lists = self.adjacency.lists
+        frontier = {source: max_depth}
+        best = dict(frontier)
+        remaining = max_depth
+        while len(frontier) < size and remaining > 0 and target not in frontier:
+            remaining -= 1
+            next_frontier = {}
+            for node in frontier:
+                for child in lists[node]:
+                    if best.get(child, -1) < remaining:
+                        best[child] = remaining
+                        next_frontier[child] = remaining
+            frontier = next_frontier
+        
+        if target in frontier:
+            return [], True
+        return list(frontier.items()), False
+    
+    def parallel_iterative_deepening_dfs(self, source, target, max_depth, workers=None, tasks_per_worker=8):
+        # Untraced iterative deepening on a process pool. Each depth iteration
+        # is split into many more subtrees than workers and handed out one at
+        # a time, so a worker that finishes a small subtree picks up the next
+        # one while others are still busy with large ones. Returns the depth
+        # the target was found at, or None.
+        source_id, target_id = self._lookup(source, target)
+        if source_id is None:
+            return 0 if source == target and max_depth >= 0 else None
+        workers = workers or multiprocessing.cpu_count()
+        found = multiprocessing.Event()
+        
+        initargs = (self.adjacency.lists, target_id, found, self.table.capacity)
+        with multiprocessing.Pool(workers, initializer=_init_parallel_worker, initargs=initargs) as pool:
+            for depth in range(max_depth + 1):
+                tasks, reached = self.split_frontier(source_id, target_id, depth, workers * tasks_per_worker)
+                if reached:
+                    return depth
                 
-        print(f"\nTarget {target} not found within depth {max_depth}")
-        return False
+                for result in pool.imap_unordered(_parallel_subtree_search, tasks, 1):
+                    if result:
+                        # Leaving the block terminates the remaining workers
+                        return depth
+        
+        return None
+    
+    def iterative_deepening_dfs(self, source, target, max_depth, observer=None):
+        # True if target is found within max_depth of source. The depth it
+        # was found at comes from iterative_deepening_depth or on_found.
+        return self.iterative_deepening_depth(source, target, max_depth, observer) is not None
+    
+    def iterative_deepening_depth(self, source, target, max_depth, observer=None):
+        # Returns the depth the target was found at, or None. Events go to
+        # observer when one is given; otherwise the plain search runs.
+        source_id, target_id = self._lookup(source, target)
+        
+        if observer is None:
+            if source_id is None:
+                return 0 if source == target and max_depth >= 0 else None
+            # Entries hold the remaining depth searched for this target, so
+            # they stay valid across iterations; clear only once per call
+            self.table.clear()
+            for depth in range(max_depth + 1):
+                if self._depth_limited_search(source_id, target_id, depth):
+                    return depth
+            return None
+        
+        for depth in range(max_depth + 1):
+            # Cleared per iteration so the observer sees every visit again
+            self.table.clear()
+            observer.on_iteration(depth)
+            if source_id is None:
+                # Visited and, below the limit, expanded with no children
+                observer.on_visit(source, 0)
+                found = source == target
+                if not found and depth > 0:
+                    observer.on_expand(source, 0)
+            else:
+                found = self._observed_depth_limited_search(source_id, target_id, depth, 0, observer)
+            if found:
+                observer.on_found(target, depth)
+            observer.on_iteration_end(depth, None)
+            if found:
+                return depth
+        
+        return None
     
     def depth_limited_search_with_print(self, source, target, max_depth):
-        self.visited.add(source)
-        print(source, end=" ")
+        # Prints the vertices visited while looking for target within
+        # max_depth of source. Table entries only hold for the target they
+        # were recorded against, so start empty.
+        source_id, target_id = self._lookup(source, target)
+        if source_id is None:
+            VisitPrinter().on_visit(source, 0)
+            return source == target
+        self.table.clear()
+        return self._observed_depth_limited_search(source_id, target_id, max_depth, 0, VisitPrinter())
+    
+    def _observed_depth_limited_search(self, source, target, max_depth, depth, observer):
+        # A node is skipped only if it was already searched with at least as
+        # much depth left, so nodes reachable by a shorter path are still
+        # explored
+        if self.table.explored(source, max_depth):
+            return False
+        
+        names = self.nodes.names
+        observer.on_visit(names[source], depth)
         
         if source == target:
             return True
         
         if max_depth <= 0:
             return False
-            
-        for neighbor in self.graph[source]:
-            if neighbor not in self.visited:
-                if self.depth_limited_search_with_print(neighbor, target, max_depth - 1):
-                    return True
         
+        observer.on_expand(names[source], depth)
+        for child in self.adjacency.lists[source]:
+            if self._observed_depth_limited_search(child, target, max_depth - 1, depth + 1, observer):
+                return True
+        
+        self.table.store(source, max_depth)
+        return False
+
+# Search state of a parallel worker process, set once by the pool initializer
+_worker_lists = None
+_worker_target = None
+_worker_found = None
+_worker_table = None
+_worker_steps = 0
+
+class _Cancelled(Exception):
+    pass
+
+def _init_parallel_worker(lists, target, found, table_size):
+    global _worker_lists, _worker_target, _worker_found, _worker_table
+    _worker_lists = lists
+    _worker_target = target
+    _worker_found = found
+    # Entries stay valid across depth iterations, so the table is kept for
+    # the lifetime of the worker
+    _worker_table = TranspositionTable(table_size)
+
+def _search_subtree(node, remaining):
+    global _worker_steps
+    if node == _worker_target:
+        return True
+    
+    if remaining <= 0 or _worker_table.explored(node, remaining):
         return False
+    
+    # Poll the shared flag every 1024 expansions, not on every node
+    _worker_steps += 1
+    if not _worker_steps & 1023 and _worker_found.is_set():
+        raise _Cancelled
+    
+    for child in _worker_lists[node]:
+        if _search_subtree(child, remaining - 1):
+            return True
+    
+    _worker_table.store(node, remaining)
+    return False
+
+def _parallel_subtree_search(task):
+    # Searches one (node, remaining depth) subtree; a hit tells every other
+    # worker to abandon its subtree
+    if _worker_found.is_set():
+        return False
+    try:
+        if _search_subtree(*task):
+            _worker_found.set()
+            return True
+    except _Cancelled:
+        pass
+    return False
 
 def main():
     tree = Tree()
@@ -76,8 +287,18 @@ def main():
         target = input("Enter the target vertex: ")
         max_depth = int(input("Enter the maximum depth to search: "))
         
+        workers = input("Worker processes for an untraced parallel search (blank for none): ").strip()
+        
         print(f"\nIterative Deepening DFS from {source} to find {target}:")
-        tree.iterative_deepening_dfs(source, target, max_depth)
+        if workers:
+            depth = tree.parallel_iterative_deepening_dfs(source, target, max_depth, int(workers))
+        else:
+            depth = tree.iterative_deepening_depth(source, target, max_depth, VisitPrinter())
+        
+        if depth is None:
+            print(f"\nTarget {target} not found within depth {max_depth}")
+        else:
+            print(f"\nTarget {target} found at depth {depth}")
             
     except ValueError:
         print("Please enter a valid number.")
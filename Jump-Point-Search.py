@@ -0,0 +1,224 @@
+import math
+
+from priority_queue import LazyHeap
+
+class Grid:
+    # Uniform-cost grid map with one byte per cell (0 = free, 1 = blocked).
+    # Neighbors are generated from the occupancy map, never stored.
+    def __init__(self, width, height, cells=None):
+        self.width = width
+        self.height = height
+        self.cells = cells if cells is not None else bytearray(width * height)
+
+    @classmethod
+    def from_lines(cls, lines):
+        # '#' marks a blocked cell, any other character is free
+        lines = [line.rstrip('\n') for line in lines]
+        width = max((len(line) for line in lines), default=0)
+        grid = cls(width, len(lines))
+        for y, line in enumerate(lines):
+            for x, char in enumerate(line):
+                if char == '#':
+                    grid.cells[y * width + x] = 1
+        return grid
+
+    def walkable(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and not self.cells[y * self.width + x]
+
+    def neighbors(self, x, y, diagonal):
+        # Diagonal moves are only allowed when both side cells are free,
+        # so paths never cut corners
+        walkable = self.walkable
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            if walkable(x + dx, y + dy):
+                yield x + dx, y + dy
+        if diagonal:
+            for dx, dy in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+                if walkable(x + dx, y) and walkable(x, y + dy) and walkable(x + dx, y + dy):
+                    yield x + dx, y + dy
+
+def distance(a, b, diagonal):
+    # Octile distance on 8-connected grids, Manhattan distance on 4-connected ones
+    dx = abs(a[0] - b[0])
+    dy = abs(a[1] - b[1])
+    if diagonal:
+        return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
+    return dx + dy
+
+def _jump(grid, x, y, dx, dy, goal, diagonal):
+    # Steps from (x, y) in direction (dx, dy) and returns the first jump point,
+    # or None when the line runs into a wall without meeting one
+    walkable = grid.walkable
+    while True:
+        x += dx
+        y += dy
+        if not walkable(x, y):
+            return None
+        if (x, y) == goal:
+            return x, y
+
+        if dx and dy:
+            # A diagonal step is a jump point if a straight line from it has one
+            if _jump(grid, x, y, dx, 0, goal, diagonal) or _jump(grid, x, y, 0, dy, goal, diagonal):
+                return x, y
+            if not (walkable(x + dx, y) and walkable(x, y + dy)):
+                return None
+        elif dx:
+            # Forced neighbor: a free cell beside us whose cell behind is blocked
+            if ((walkable(x, y - 1) and not walkable(x - dx, y - 1))
+                    or (walkable(x, y + 1) and not walkable(x - dx, y + 1))):
+                return x, y
+        else:
+            if ((walkable(x - 1, y) and not walkable(x - 1, y - dy))
+                    or (walkable(x + 1, y) and not walkable(x + 1, y - dy))):
+                return x, y
+            # Without diagonal moves, vertical lines also stop at horizontal jump points
+            if not diagonal and (_jump(grid, x, y, 1, 0, goal, diagonal)
+                                 or _jump(grid, x, y, -1, 0, goal, diagonal)):
+                return x, y
+
+def _pruned_neighbors(grid, x, y, parent, diagonal):
+    # Neighbors that can start a shorter path than one going through parent
+    if parent is None:
+        return list(grid.neighbors(x, y, diagonal))
+
+    walkable = grid.walkable
+    dx = (x > parent[0]) - (x < parent[0])
+    dy = (y > parent[1]) - (y < parent[1])
+    result = []
+
+    if dx and dy:
+        if walkable(x, y + dy):
+            result.append((x, y + dy))
+        if walkable(x + dx, y):
+            result.append((x + dx, y))
+        if walkable(x, y + dy) and walkable(x + dx, y) and walkable(x + dx, y + dy):
+            result.append((x + dx, y + dy))
+    elif dx:
+        ahead = walkable(x + dx, y)
+        up = walkable(x, y + 1)
+        down = walkable(x, y - 1)
+        if ahead:
+            result.append((x + dx, y))
+            if diagonal and up and walkable(x + dx, y + 1):
+                result.append((x + dx, y + 1))
+            if diagonal and down and walkable(x + dx, y - 1):
+                result.append((x + dx, y - 1))
+        if up:
+            result.append((x, y + 1))
+        if down:
+            result.append((x, y - 1))
+    else:
+        ahead = walkable(x, y + dy)
+        right = walkable(x + 1, y)
+        left = walkable(x - 1, y)
+        if ahead:
+            result.append((x, y + dy))
+            if diagonal and right and walkable(x + 1, y + dy):
+                result.append((x + 1, y + dy))
+            if diagonal and left and walkable(x - 1, y + dy):
+                result.append((x - 1, y + dy))
+        if right:
+            result.append((x + 1, y))
+        if left:
+            result.append((x - 1, y))
+    return result
+
+def a_star_grid(grid, start, goal, diagonal=True, jump=True, stats=None):
+    # A* over grid cells given as (x, y). With jump=True successors are the
+    # jump points found by Jump Point Search instead of the adjacent cells.
+    if not grid.walkable(*start) or not grid.walkable(*goal):
+        return None
+
+    width = grid.width
+    g_scores = {start: 0}
+    came_from = {start: None}
+    open_list = LazyHeap()
+    open_list.push(start[1] * width + start[0], distance(start, goal, diagonal))
+    expanded = 0
+
+    while open_list:
+        _, cell = open_list.pop()
+        current = (cell % width, cell // width)
+        expanded += 1
+
+        if current == goal:
+            break
+
+        if jump:
+            successors = []
+            for x, y in _pruned_neighbors(grid, current[0], current[1], came_from[current], diagonal):
+                point = _jump(grid, current[0], current[1], x - current[0], y - current[1], goal, diagonal)
+                if point is not None:
+                    successors.append(point)
+        else:
+            successors = grid.neighbors(current[0], current[1], diagonal)
+
+        for neighbor in successors:
+            tentative_g_score = g_scores[current] + distance(current, neighbor, diagonal)
+            if tentative_g_score < g_scores.get(neighbor, float('inf')):
+                g_scores[neighbor] = tentative_g_score
+                came_from[neighbor] = current
+                f_score = tentative_g_score + distance(neighbor, goal, diagonal)
+                open_list.push(neighbor[1] * width + neighbor[0], f_score)
+    else:
+        if stats is not None:
+            stats.update(expanded=expanded, max_heap=open_list.max_size)
+        return None
+
+    if stats is not None:
+        stats.update(expanded=expanded, max_heap=open_list.max_size, cost=g_scores[goal])
+
+    # Walk back over the jump points and fill in the cells between them
+    points = []
+    current = goal
+    while current is not None:
+        points.append(current)
+        current = came_from[current]
+    points.reverse()
+
+    path = [points[0]]
+    for (x, y), (tx, ty) in zip(points, points[1:]):
+        dx = (tx > x) - (tx < x)
+        dy = (ty > y) - (ty < y)
+        while (x, y) != (tx, ty):
+            if x == tx:
+                dx = 0
+            if y == ty:
+                dy = 0
+            x += dx
+            y += dy
+            path.append((x, y))
+    return path
+
+def main():
+    print("Grid Pathfinding with Jump Point Search")
+    print("=======================================")
+
+    try:
+        height = int(input("Enter the number of grid rows: "))
+        print("Enter each row, '#' for a blocked cell and '.' for a free one:")
+        grid = Grid.from_lines([input(f"Row {y}: ") for y in range(height)])
+
+        start = tuple(int(v) for v in input("\nEnter start cell (format: 'x y'): ").split())
+        goal = tuple(int(v) for v in input("Enter goal cell (format: 'x y'): ").split())
+        diagonal = input("Allow diagonal moves? (y/n): ").strip().lower() == 'y'
+
+        for name, jump in (("A*", False), ("Jump Point Search", True)):
+            stats = {}
+            path = a_star_grid(grid, start, goal, diagonal, jump, stats)
+            print(f"\n{name}:")
+            if path:
+                print("Path:", " -> ".join(f"({x},{y})" for x, y in path))
+                print(f"Cost: {stats['cost']:.2f}")
+            else:
+                print("No path found")
+            print("Nodes expanded:", stats['expanded'])
+
+    except ValueError:
+        print("Please enter valid numbers.")
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+from array import array
+
+class NodeTable:
+    # Interning table: every distinct node name is stored once and mapped to
+    # a dense integer id, so traversals can work on ints and translate back
+    # to names only for output
+    def __init__(self):
+        self.names = []   # id -> name
+        self.ids = {}     # name -> id
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def intern(self, name):
+        i = self.ids.get(name)
+        if i is None:
+            i = len(self.names)
+            self.names.append(name)
+            self.ids[name] = i
+        return i
+
+    def canonical(self, name):
+        # The stored object for this name, so equal names share one string
+        return self.names[self.intern(name)]
+
+class CSRGraph:
+    # Compact adjacency over interned ids: the neighbors of node i are
+    # targets[offsets[i]:offsets[i + 1]] in adjacency list order
+    def __init__(self, adjacency, nodes=None):
+        # adjacency maps a name to its neighbor names. A shared NodeTable
+        # keeps ids stable across rebuilds of a growing graph.
+        self.nodes = nodes if nodes is not None else NodeTable()
+        intern = self.nodes.intern
+        for name in adjacency:
+            intern(name)
+            for neighbor in adjacency[name]:
+                intern(neighbor)
+
+        # A snapshot of the names and ids, so a NodeTable that keeps growing
+        # after the build never yields an id past the end of offsets
+        self.names = self.nodes.names[:]
+        self.ids = dict(self.nodes.ids)
+        self.offsets = array('i', [0])
+        self.targets = array('i')
+
+        ids = self.ids
+        for name in self.names:
+            neighbors = adjacency[name] if name in adjacency else ()
+            self.targets.extend([ids[neighbor] for neighbor in neighbors])
+            self.offsets.append(len(self.targets))
+
+    @classmethod
+    def from_lists(cls, adjacency):
+        # Snapshot of an AdjacencyLists, built from the id arrays directly
+        graph = cls.__new__(cls)
+        graph.nodes = adjacency.nodes
+        graph.names = graph.nodes.names[:]
+        graph.ids = dict(graph.nodes.ids)
+        graph.offsets = array('i', [0])
+        graph.targets = array('i')
+        for i in range(len(graph.names)):
+            graph.targets.extend(adjacency.neighbors(i))
+            graph.offsets.append(len(graph.targets))
+        return graph
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def neighbors(self, i):
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+class AdjacencyLists:
+    # Growable adjacency over the ids of a NodeTable: one array('i') of
+    # neighbor ids per node, appended to as edges arrive, so traversals run
+    # on the live graph instead of a snapshot rebuilt after every change
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.lists = []
+
+    def __len__(self):
+        return len(self.lists)
+
+    def add_edge(self, u, v):
+        # Directed edge between interned ids u -> v
+        while len(self.lists) < len(self.nodes):
+            self.lists.append(array('i'))
+        self.lists[u].append(v)
+
+    def neighbors(self, i):
+        # Ids interned without any edge yet have no array
+        return self.lists[i] if i < len(self.lists) else ()
+
+    def id_of(self, name):
+        # Id of a node with at least one edge, or None
+        i = self.nodes.ids.get(name)
+        if i is None or not self.neighbors(i):
+            return None
+        return i
+
+class ComponentIndex:
+    # Union-find over the ids of a NodeTable, with path compression and union
+    # by rank, kept up to date as undirected edges arrive
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.parent = array('i')
+        self.rank = array('B')
+        self._count = 0
+
+    def _grow(self):
+        # Every node interned since the last call starts as its own component
+        while len(self.parent) < len(self.nodes):
+            self.parent.append(len(self.parent))
+            self.rank.append(0)
+            self._count += 1
+
+    @property
+    def count(self):
+        # Number of components, counting nodes interned without any edge
+        self._grow()
+        return self._count
+
+    def find(self, i):
+        parent = self.parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def union(self, u, v):
+        # Merge the components of names u and v; False if already joined
+        return self.union_ids(self.nodes.intern(u), self.nodes.intern(v))
+
+    def union_ids(self, u, v):
+        # union for callers that already hold the interned ids
+        self._grow()
+        root_u = self.find(u)
+        root_v = self.find(v)
+        if root_u == root_v:
+            return False
+        if self.rank[root_u] < self.rank[root_v]:
+            root_u, root_v = root_v, root_u
+        self.parent[root_v] = root_u
+        if self.rank[root_u] == self.rank[root_v]:
+            self.rank[root_u] += 1
+        self._count -= 1
+        return True
+
+    def connected(self, u, v):
+        # Reachability between two names in the undirected graph
+        if u not in self.nodes or v not in self.nodes:
+            return u == v
+        self._grow()
+        return self.find(self.nodes.ids[u]) == self.find(self.nodes.ids[v])
+
+    def component_of(self, name):
+        # Representative id of the name's component, stable until the next union
+        if name not in self.nodes:
+            return None
+        self._grow()
+        return self.find(self.nodes.ids[name])
+
+    def labels(self):
+        # Dense component labels 0..count-1, indexed by node id
+        self._grow()
+        labels = array('i', [-1]) * len(self.parent)
+        roots = {}
+        for i in range(len(self.parent)):
+            root = self.find(i)
+            if root not in roots:
+                roots[root] = len(roots)
+            labels[i] = roots[root]
+        return labels
@@ -0,0 +1,255 @@
+import heapq
+import random
+import time
+
+class IndexedHeap:
+    # Binary min-heap with a position index, so an item's priority can be
+    # lowered in place (decrease-key) instead of pushing a duplicate entry
+    def __init__(self):
+        self.heap = []       # (priority, item) pairs
+        self.position = {}   # item -> index in heap
+        self.max_size = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.position
+
+    def priority(self, item):
+        return self.heap[self.position[item]][0]
+
+    def peek(self):
+        return self.heap[0]
+
+    def push(self, item, priority):
+        # Insert the item, or lower its priority if it is already queued.
+        # Returns False when the queued priority was already as good.
+        i = self.position.get(item)
+        if i is None:
+            self.heap.append((priority, item))
+            i = len(self.heap) - 1
+            self.position[item] = i
+            if len(self.heap) > self.max_size:
+                self.max_size = len(self.heap)
+        elif priority < self.heap[i][0]:
+            self.heap[i] = (priority, item)
+        else:
+            return False
+        self._sift_up(i)
+        return True
+
+    def pop(self):
+        heap = self.heap
+        last = heap.pop()
+        if heap:
+            top = heap[0]
+            heap[0] = last
+            self.position[last[1]] = 0
+            self._sift_down(0)
+        else:
+            top = last
+        del self.position[top[1]]
+        return top
+
+    def _sift_up(self, i):
+        heap = self.heap
+        position = self.position
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if entry < heap[parent]:
+                heap[i] = heap[parent]
+                position[heap[i][1]] = i
+                i = parent
+            else:
+                break
+        heap[i] = entry
+        position[entry[1]] = i
+
+    def _sift_down(self, i):
+        heap = self.heap
+        position = self.position
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1] < heap[child]:
+                child += 1
+            if heap[child] < entry:
+                heap[i] = heap[child]
+                position[heap[i][1]] = i
+                i = child
+            else:
+                break
+        heap[i] = entry
+        position[entry[1]] = i
+
+class LazyHeap:
+    # heapq with lazy deletion: an improved priority pushes a new entry and
+    # the stale ones are skipped when they reach the top
+    def __init__(self):
+        self.heap = []
+        self.best = {}   # item -> priority of its live entry
+        self.max_size = 0
+
+    def __len__(self):
+        return len(self.best)
+
+    def __contains__(self, item):
+        return item in self.best
+
+    def priority(self, item):
+        return self.best[item]
+
+    def peek(self):
+        self._skip_stale()
+        return self.heap[0]
+
+    def push(self, item, priority):
+        if item in self.best and self.best[item] <= priority:
+            return False
+        self.best[item] = priority
+        heapq.heappush(self.heap, (priority, item))
+        if len(self.heap) > self.max_size:
+            self.max_size = len(self.heap)
+        return True
+
+    def pop(self):
+        self._skip_stale()
+        priority, item = heapq.heappop(self.heap)
+        del self.best[item]
+        return priority, item
+
+    def _skip_stale(self):
+        heap = self.heap
+        best = self.best
+        while best.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+class RadixHeap:
+    # Monotone radix heap for non-negative integer priorities: every pushed
+    # priority must be at least the last popped one, as in Dijkstra. An entry
+    # sits in the bucket numbered by the highest bit where it differs from the
+    # last popped priority, so each entry moves down at most once per bit.
+    # Improved priorities push a new entry and stale ones are skipped.
+    def __init__(self):
+        self.buckets = [[]]
+        self.last = 0
+        self.best = {}   # item -> priority of its live entry
+        self.size = 0
+        self.max_size = 0
+
+    def __len__(self):
+        return len(self.best)
+
+    def __contains__(self, item):
+        return item in self.best
+
+    def priority(self, item):
+        return self.best[item]
+
+    def push(self, item, priority):
+        if priority < self.last:
+            raise ValueError("RadixHeap priorities must not decrease below the last pop")
+        if item in self.best and self.best[item] <= priority:
+            return False
+        self.best[item] = priority
+        index = (priority ^ self.last).bit_length()
+        while len(self.buckets) <= index:
+            self.buckets.append([])
+        self.buckets[index].append((priority, item))
+        self.size += 1
+        if self.size > self.max_size:
+            self.max_size = self.size
+        return True
+
+    def peek(self):
+        self._refill()
+        return self.buckets[0][-1]
+
+    def pop(self):
+        self._refill()
+        priority, item = self.buckets[0].pop()
+        self.size -= 1
+        del self.best[item]
+        return priority, item
+
+    def _refill(self):
+        # Make sure bucket 0 ends with a live entry
+        buckets = self.buckets
+        best = self.best
+        while True:
+            bucket = buckets[0]
+            while bucket:
+                priority, item = bucket[-1]
+                if best.get(item) == priority:
+                    return
+                bucket.pop()
+                self.size -= 1
+
+            # Redistribute the first non-empty bucket around its minimum
+            index = 1
+            while not buckets[index]:
+                index += 1
+            entries = buckets[index]
+            buckets[index] = []
+            self.last = last = min(entries)[0]
+            for entry in entries:
+                buckets[(entry[0] ^ last).bit_length()].append(entry)
+
+def _random_graph(n, degree, seed=0):
+    rng = random.Random(seed)
+    return {node: [(rng.randrange(n), rng.randint(1, 100)) for _ in range(degree)]
+            for node in range(n)}
+
+def _dijkstra_push_every_improvement(graph, start):
+    # The previous a_star loop: no closed set, one heap entry per relaxation
+    dist = {start: 0}
+    heap = [(0, start)]
+    expanded = max_size = 0
+    while heap:
+        d, current = heapq.heappop(heap)
+        expanded += 1
+        for neighbor, cost in graph[current]:
+            if d + cost < dist.get(neighbor, float('inf')):
+                dist[neighbor] = d + cost
+                heapq.heappush(heap, (d + cost, neighbor))
+                max_size = max(max_size, len(heap))
+    return expanded, max_size
+
+def _dijkstra_with(queue_class, graph, start):
+    dist = {start: 0}
+    queue = queue_class()
+    queue.push(start, 0)
+    expanded = 0
+    while queue:
+        d, current = queue.pop()
+        expanded += 1
+        for neighbor, cost in graph[current]:
+            if d + cost < dist.get(neighbor, float('inf')):
+                dist[neighbor] = d + cost
+                queue.push(neighbor, d + cost)
+    return expanded, queue.max_size
+
+def main():
+    print("Priority queue benchmark (one-to-all search on random graphs)")
+    print(f"{'nodes':>8} {'queue':>22} {'expanded':>9} {'max heap':>9} {'seconds':>8}")
+    for n in (10000, 100000):
+        graph = _random_graph(n, 8)
+        runs = [
+            ("heapq, no closed set", lambda: _dijkstra_push_every_improvement(graph, 0)),
+            ("IndexedHeap", lambda: _dijkstra_with(IndexedHeap, graph, 0)),
+            ("LazyHeap", lambda: _dijkstra_with(LazyHeap, graph, 0)),
+            ("RadixHeap", lambda: _dijkstra_with(RadixHeap, graph, 0)),
+        ]
+        for name, run in runs:
+            begin = time.perf_counter()
+            expanded, max_size = run()
+            elapsed = time.perf_counter() - begin
+            print(f"{n:>8} {name:>22} {expanded:>9} {max_size:>9} {elapsed:>8.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import sys
+import time
+
+class SearchObserver:
+    # Events reported by the instrumented paths of the iterative deepening
+    # searches. Every hook is a no-op here, so subclasses only override what
+    # they need. A search given no observer runs a separate loop that makes
+    # none of these calls.
+    def on_iteration(self, bound):
+        # A new depth limit or f-cost threshold iteration starts
+        pass
+
+    def on_visit(self, node, depth):
+        # The search entered node at the given depth
+        pass
+
+    def on_expand(self, node, depth):
+        # The successors of node are about to be generated
+        pass
+
+    def on_prune(self, node, f):
+        # node was cut off because its f-cost exceeded the threshold
+        pass
+
+    def on_threshold(self, bound):
+        # The bound for the next iteration has been chosen
+        pass
+
+    def on_found(self, node, depth):
+        pass
+
+    def on_iteration_end(self, bound, path):
+        # path is the search's own path or visit order for this iteration
+        pass
+
+class ObserverGroup(SearchObserver):
+    # Forwards every event to several observers, e.g. a printer and stats
+    def __init__(self, *observers):
+        self.observers = observers
+
+    def on_iteration(self, bound):
+        for observer in self.observers:
+            observer.on_iteration(bound)
+
+    def on_visit(self, node, depth):
+        for observer in self.observers:
+            observer.on_visit(node, depth)
+
+    def on_expand(self, node, depth):
+        for observer in self.observers:
+            observer.on_expand(node, depth)
+
+    def on_prune(self, node, f):
+        for observer in self.observers:
+            observer.on_prune(node, f)
+
+    def on_threshold(self, bound):
+        for observer in self.observers:
+            observer.on_threshold(bound)
+
+    def on_found(self, node, depth):
+        for observer in self.observers:
+            observer.on_found(node, depth)
+
+    def on_iteration_end(self, bound, path):
+        for observer in self.observers:
+            observer.on_iteration_end(bound, path)
+
+class SearchStats(SearchObserver):
+    # Counts visits and expansions, tracks the deepest node reached and times
+    # every iteration. Totals are kept in plain attributes and each iteration
+    # is summarized from their difference when it ends.
+    def __init__(self):
+        self.visited = 0
+        self.expanded = 0
+        self.max_depth = 0
+        self.found = None
+        self.thresholds = []
+        self.iterations = []
+        self._start = None
+        self._iteration_depth = 0
+
+    def on_iteration(self, bound):
+        self._start = (time.perf_counter(), self.visited, self.expanded)
+        self._iteration_depth = 0
+
+    def on_visit(self, node, depth):
+        self.visited += 1
+        if depth > self._iteration_depth:
+            self._iteration_depth = depth
+            if depth > self.max_depth:
+                self.max_depth = depth
+
+    def on_expand(self, node, depth):
+        self.expanded += 1
+
+    def on_threshold(self, bound):
+        self.thresholds.append(bound)
+
+    def on_found(self, node, depth):
+        self.found = {'node': node, 'depth': depth}
+
+    def on_iteration_end(self, bound, path):
+        started, visited, expanded = self._start
+        self.iterations.append({
+            'bound': bound,
+            'visited': self.visited - visited,
+            'expanded': self.expanded - expanded,
+            'max_depth': self._iteration_depth,
+            'seconds': time.perf_counter() - started,
+        })
+
+    def summary(self):
+        return {
+            'visited': self.visited,
+            'expanded': self.expanded,
+            'max_depth': self.max_depth,
+            'found': self.found,
+            'thresholds': self.thresholds,
+            'iterations': self.iterations,
+        }
+
+    def to_json(self, indent=None):
+        return json.dumps(self.summary(), indent=indent)
+
+def load_script(name):
+    # The search scripts have dashes in their file names, so they are loaded
+    # by path instead of imported. The module is registered in sys.modules
+    # so that process pools can pickle its functions by module name.
+    directory = os.path.dirname(os.path.abspath(__file__))
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    module_name = name.replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(directory, name + '.py'))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+def _random_tree(n, branching, seed=0):
+    # Every node after the first gets a random parent among the previous
+    # n // branching nodes' worth, giving a bushy tree of moderate depth
+    rng = random.Random(seed)
+    tree = {str(0): []}
+    for node in range(1, n):
+        parent = rng.randrange(max(1, node // branching))
+        tree[str(node)] = []
+        tree[str(parent)].append(str(node))
+    return tree
+
+def _time(run, repeat=5):
+    # Best of a few runs, so one-off work such as compiling the graph on the
+    # first call is not charged to whichever variant happens to run first
+    best = float('inf')
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run()
+        best = min(best, time.perf_counter() - begin)
+    return best
+
+def main():
+    iddfs = load_script('IDDFS')
+    deepening = load_script('Iterative-Deepening-Depth-First-Search')
+    ida = load_script('IDA-Star')
+
+    tree = _random_tree(100000, 3)
+    graph = deepening.Tree()
+    for parent, children in tree.items():
+        for child in children:
+            graph.add_edge(parent, child)
+    # Unit edge costs and a zero heuristic make IDA* deepen one step at a time
+    weighted = {node: {child: 1 for child in children} for node, children in tree.items()}
+    zero = {node: 0 for node in tree}
+    target = str(len(tree) - 1)
+
+    searches = [
+        ("IDDFS.py", {
+            'printing': lambda: iddfs.iterative_deepening_search(tree, '0', observer=iddfs.TracePrinter()),
+            'stats': lambda: iddfs.iterative_deepening_search(tree, '0', observer=SearchStats()),
+            'no-op observer': lambda: iddfs.iterative_deepening_search(tree, '0', observer=SearchObserver()),
+            'no observer': lambda: iddfs.iterative_deepening_search(tree, '0'),
+        }),
+        ("Iterative-Deepening", {
+            'printing': lambda: graph.iterative_deepening_dfs('0', target, 60, observer=deepening.VisitPrinter()),
+            'stats': lambda: graph.iterative_deepening_dfs('0', target, 60, observer=SearchStats()),
+            'no-op observer': lambda: graph.iterative_deepening_dfs('0', target, 60, observer=SearchObserver()),
+            'no observer': lambda: graph.iterative_deepening_dfs('0', target, 60),
+        }),
+        ("IDA-Star.py", {
+            'printing': lambda: ida.ida_star('0', target, weighted, zero, observer=ida.ThresholdPrinter()),
+            'stats': lambda: ida.ida_star('0', target, weighted, zero, observer=SearchStats()),
+            'no-op observer': lambda: ida.ida_star('0', target, weighted, zero, observer=SearchObserver()),
+            'no observer': lambda: ida.ida_star('0', target, weighted, zero),
+        }),
+    ]
+
+    print(f"Observer overhead on a {len(tree)} node random tree (printing goes to a buffer)")
+    print(f"{'search':>20} {'observer':>15} {'seconds':>8} {'vs none':>8}")
+    for name, runs in searches:
+        baseline = _time(runs['no observer'])
+        for label, run in runs.items():
+            elapsed = baseline if label == 'no observer' else _time(run)
+            print(f"{name:>20} {label:>15} {elapsed:>8.3f} {elapsed / baseline:>7.2f}x")
+
+    stats = SearchStats()
+    ida.ida_star('0', target, weighted, zero, observer=stats)
+    print("\nIDA* statistics:")
+    print(stats.to_json(indent=2))
+
+if __name__ == "__main__":
+    main()